@@ -4,8 +4,9 @@
 
 import time
 import requests
+from requests.adapters import HTTPAdapter
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from openai import OpenAI, APIError, APIConnectionError, RateLimitError
 from openai import APITimeoutError
 from utils.exceptions import AIAnalysisException
@@ -26,10 +27,30 @@ class AIModelProvider(ABC):
     
     @abstractmethod
     def chat(self, prompt: str, temperature: float = 0.7,
-             max_tokens: int = 2000) -> str:
-        """发送聊天请求"""
+             max_tokens: int = 2000, system_prompt: Optional[str] = None) -> str:
+        """发送聊天请求
+        
+        system_prompt 为空时使用实例的默认系统提示词。调用方把固定的说明放在
+        系统提示词中、只在 prompt 中放变化的内容，服务端可复用相同前缀的缓存。
+        """
         pass
     
+    def chat_stream(self, prompt: str, temperature: float = 0.7,
+                    max_tokens: int = 2000, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """发送流式聊天请求，逐段返回生成的文本
+        
+        默认一次性返回完整响应，支持流式输出的提供商可覆盖此方法。
+        调用方提前结束迭代时应关闭迭代器，以便释放底层连接。
+        """
+        yield self.chat(prompt, temperature=temperature, max_tokens=max_tokens, system_prompt=system_prompt)
+    
+    def _build_messages(self, prompt: str, system_prompt: Optional[str] = None) -> list:
+        """构建请求消息列表"""
+        return [
+            {"role": "system", "content": system_prompt or self.system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+    
     def _retry_with_exponential_backoff(self, func, *args, **kwargs) -> Any:
         """使用指数退避策略重试函数调用"""
         last_exception = None
@@ -89,14 +110,11 @@ class _OpenAICompatibleProvider(AIModelProvider):
         self.client = OpenAI(api_key=self.api_key, base_url=self.base_url, timeout=self.timeout)
 
     def chat(self, prompt: str, temperature: float = 0.7,
-             max_tokens: int = 2000) -> str:
+             max_tokens: int = 2000, system_prompt: Optional[str] = None) -> str:
         def _make_request():
             response = self.client.chat.completions.create(
                 model=self.model_name,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._build_messages(prompt, system_prompt),
                 temperature=temperature,
                 max_tokens=max_tokens
             )
@@ -104,6 +122,29 @@ class _OpenAICompatibleProvider(AIModelProvider):
 
         return self._retry_with_exponential_backoff(_make_request)
 
+    def chat_stream(self, prompt: str, temperature: float = 0.7,
+                    max_tokens: int = 2000, system_prompt: Optional[str] = None) -> Iterator[str]:
+        def _make_request():
+            return self.client.chat.completions.create(
+                model=self.model_name,
+                messages=self._build_messages(prompt, system_prompt),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+
+        # 只重试建立连接，已开始输出的流不重试
+        stream = self._retry_with_exponential_backoff(_make_request)
+        try:
+            for chunk in stream:
+                if chunk.choices:
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        yield content
+        finally:
+            # 调用方提前结束时关闭响应，不再接收剩余 token
+            stream.close()
+
 class OpenAIProvider(_OpenAICompatibleProvider):
     def __init__(self, api_key: str, base_url="https://api.openai.com/v1",
                  model_name="gpt-4o-mini", **kwargs):
@@ -127,8 +168,19 @@ class DeepseekProvider(_OpenAICompatibleProvider):
 class CustomProvider(AIModelProvider):
     """通用 HTTP API Provider"""
 
+    # 连接池大小，与测试用例生成器的默认并发数匹配
+    POOL_MAXSIZE = 16
+
+    def __init__(self, api_key: str, base_url: str, model_name: str, **kwargs):
+        super().__init__(api_key, base_url, model_name, **kwargs)
+        # 复用 HTTP 连接，并发请求时避免每次重新建立 TCP/TLS 连接
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.POOL_MAXSIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
     def chat(self, prompt: str, temperature: float = 0.7,
-             max_tokens: int = 2000) -> str:
+             max_tokens: int = 2000, system_prompt: Optional[str] = None) -> str:
         def _make_request():
             url = f"{self.base_url.rstrip('/')}/chat/completions"
             headers = {
@@ -138,15 +190,12 @@ class CustomProvider(AIModelProvider):
             }
             payload = {
                 "model": self.model_name,
-                "messages": [
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
+                "messages": self._build_messages(prompt, system_prompt),
                 "temperature": temperature,
                 "max_tokens": max_tokens
             }
 
-            response = requests.post(url, headers=headers, json=payload, timeout=self.timeout)
+            response = self.session.post(url, headers=headers, json=payload, timeout=self.timeout)
 
             if response.status_code == 401:
                 raise AIAnalysisException("API 认证失败，请检查 API Key",
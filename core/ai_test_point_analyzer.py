@@ -11,8 +11,20 @@ from core.ai_model_provider import AIModelProvider
 from utils.models import TestPointsResult, TestPoint, TestCategory, TestType, Priority
 from utils.exceptions import AIAnalysisException
 from utils.cache_manager import CacheManager
+from utils.json_utils import extract_json_object, json_loads
 from utils.log_manager import get_logger
 
+# JSON 修复使用的正则（按 _fix_json 中的应用顺序）
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+_NEWLINE_INDENT_RE = re.compile(r'\n\s*')
+_LINE_COMMENT_RE = re.compile(r'//.*?\n')
+_BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_UNQUOTED_VALUE_RE = re.compile(r':\s*([^",\[\]{}]+)(?=\s*[,}])')
+_SINGLE_QUOTED_RE = re.compile(r"'([^']*)'")
+
+# 严格模式下的测试要点 ID 格式
+_TEST_POINT_ID_RE = re.compile(r'^TP_\d{3}$')
+
 
 class AITestPointAnalyzer:
     """AI 测试要点分析器"""
@@ -382,12 +394,12 @@ class AITestPointAnalyzer:
         
         # 解析 JSON
         try:
-            result = json.loads(json_str)
+            result = json_loads(json_str)
         except json.JSONDecodeError as e:
             # 尝试修复常见的 JSON 错误
             try:
                 fixed_json = self._fix_json(json_str)
-                result = json.loads(fixed_json)
+                result = json_loads(fixed_json)
                 self.logger.warning("JSON 格式有误，已自动修复")
             except Exception:
                 raise AIAnalysisException(
@@ -400,65 +412,42 @@ class AITestPointAnalyzer:
         return result
     
     def _extract_json(self, text: str) -> Optional[str]:
-        """从文本中提取 JSON 内容"""
-        # 移除可能的 markdown 代码块标记
-        text = re.sub(r'```json\s*', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'```\s*', '', text)
-        
-        # 移除可能的前后说明文字
-        text = re.sub(r'^[^{]*', '', text)  # 移除开头的非JSON内容
-        text = re.sub(r'[^}]*$', '', text)  # 移除结尾的非JSON内容
-        
-        # 尝试找到最完整的 JSON 对象
-        # 方法1: 使用栈匹配找到完整的 { ... } 结构
-        json_start = text.find('{')
-        if json_start != -1:
-            brace_count = 0
-            json_end = json_start
-            
-            for i, char in enumerate(text[json_start:], json_start):
-                if char == '{':
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        json_end = i + 1
-                        break
-            
-            if brace_count == 0:
-                return text[json_start:json_end]
-        
-        # 方法2: 正则表达式匹配
-        match = re.search(r'\{[\s\S]*\}', text)
-        if match:
-            return match.group(0)
-        
-        # 方法3: 如果整个文本看起来像 JSON
-        text = text.strip()
-        if text.startswith('{') and text.endswith('}'):
-            return text
-        
+        """从文本中提取 JSON 内容
+
+        优先按括号深度扫描出第一个完整对象（跳过字符串内的括号，markdown 代码块标记
+        和前后说明文字自然被忽略）；括号不配对时退回首个 '{' 到末个 '}' 的片段，
+        交给 _fix_json 尝试修复。
+        """
+        json_str = extract_json_object(text)
+        if json_str:
+            return json_str
+
+        start = text.find('{')
+        end = text.rfind('}')
+        if start != -1 and end > start:
+            return text[start:end + 1]
+
         return None
     
     def _fix_json(self, json_str: str) -> str:
         """尝试修复常见的 JSON 格式错误"""
         # 移除尾部逗号
-        json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
+        json_str = _TRAILING_COMMA_RE.sub(r'\1', json_str)
         
         # 修复可能的换行问题
-        json_str = re.sub(r'\n\s*', ' ', json_str)
+        json_str = _NEWLINE_INDENT_RE.sub(' ', json_str)
         
         # 修复可能的注释
-        json_str = re.sub(r'//.*?\n', '', json_str)
-        json_str = re.sub(r'/\*.*?\*/', '', json_str, flags=re.DOTALL)
+        json_str = _LINE_COMMENT_RE.sub('', json_str)
+        json_str = _BLOCK_COMMENT_RE.sub('', json_str)
         
         # 确保字符串值被正确引用
         # 修复未引用的字符串值（简单情况）
-        json_str = re.sub(r':\s*([^",\[\]{}]+)(?=\s*[,}])', r': "\1"', json_str)
+        json_str = _UNQUOTED_VALUE_RE.sub(r': "\1"', json_str)
         
         # 修复可能的单引号问题（谨慎处理）
         # 只在明确是字符串值的情况下替换
-        json_str = re.sub(r"'([^']*)'", r'"\1"', json_str)
+        json_str = _SINGLE_QUOTED_RE.sub(r'"\1"', json_str)
         
         return json_str
     
@@ -520,7 +509,7 @@ class AITestPointAnalyzer:
             # 验证 ID 格式（在严格模式下）
             if strict_mode:
                 for tp_id in ids:
-                    if not re.match(r'^TP_\d{3}$', tp_id):
+                    if not _TEST_POINT_ID_RE.match(tp_id):
                         self.logger.warning(f"测试要点 ID 格式不正确：{tp_id}")
                         return False
             
@@ -5,6 +5,7 @@
 """
 
 import json
+from collections import Counter
 from typing import List, Dict
 from pathlib import Path
 from datetime import datetime
@@ -145,31 +146,22 @@ class ExportManager:
                 "type_distribution": {}
             }
         
-        # 优先级分布
-        priority_dist = {}
-        for priority in Priority:
-            count = sum(1 for case in test_cases if case.priority == priority)
-            if count > 0:
-                priority_dist[priority.value] = count
-        
-        # 类别分布
-        category_dist = {}
-        for category in TestCategory:
-            count = sum(1 for case in test_cases if case.category == category)
-            if count > 0:
-                category_dist[category.value] = count
-        
-        # 用例类型分布
-        type_dist = {}
+        # 一次遍历统计优先级、类别和用例类型
+        priority_counts = Counter()
+        category_counts = Counter()
+        type_counts = Counter()
         for case in test_cases:
-            case_type = case.case_type
-            type_dist[case_type] = type_dist.get(case_type, 0) + 1
+            priority_counts[case.priority] += 1
+            category_counts[case.category] += 1
+            type_counts[case.case_type] += 1
         
-
+        # 优先级、类别分布按枚举定义顺序输出
+        priority_dist = {priority.value: priority_counts[priority] for priority in Priority if priority_counts[priority]}
+        category_dist = {category.value: category_counts[category] for category in TestCategory if category_counts[category]}
         
         return {
             "total_count": len(test_cases),
             "priority_distribution": priority_dist,
             "category_distribution": category_dist,
-            "type_distribution": type_dist
+            "type_distribution": dict(type_counts)
         }
@@ -6,32 +6,637 @@
 使用AI模型优化测试步骤和期望结果，提升用例质量。
 """
 
-from typing import Dict, List, Tuple, Optional
-from utils.models import TestCase, TestStep, TestCategory, Priority, TestPoint
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple, Optional
+from utils.models import FastTestCase, FastTestStep, TestCategory, Priority, TestPoint
 from utils.log_manager import StructuredLogger
-from core.ai_model_provider import AIModelFactory
+from utils.cache_manager import CacheManager
+from utils.json_utils import extract_json_object, json_dumps, parse_json_object
+from core.ai_model_provider import AIModelFactory, AIModelProvider
+import hashlib
+import heapq
+import io
+import json
+import os
 import re
 import random
-import json
+import sys
+import threading
+
+
+# 需要前置条件的功能关键词
+_PRECONDITION_RE = re.compile("登录|权限|设置|配置")
+
+# 功能关键词及其对应页面，按匹配优先级排列
+_FEATURE_CONTEXT_PAGES = {
+    "购物车": "购物车页面",
+    "登录": "登录页面",
+    "搜索": "搜索页面",
+    "支付": "支付页面",
+}
+_FEATURE_CONTEXT_RANKS = {keyword: rank for rank, keyword in enumerate(_FEATURE_CONTEXT_PAGES)}
+_FEATURE_CONTEXT_RE = re.compile("|".join(_FEATURE_CONTEXT_PAGES))
+
+# 句子分类关键词：前置条件只看句首，验证步骤看整句
+_SENTENCE_PRECONDITION_RE = re.compile("打开|进入|启动|登录|准备|设置")
+_SENTENCE_VALIDATION_RE = re.compile("验证|检查|确认|查看|观察|测试")
+
+# 操作类型及其关键词，按识别优先级排列
+_ACTION_TYPE_KEYWORDS = {
+    "点击": ["点击", "按下", "选择", "触摸"],
+    "输入": ["输入", "填写", "编辑", "修改"],
+    "滑动": ["滑动", "拖拽", "滚动", "翻页"],
+    "查看": ["查看", "显示", "展示", "浏览"],
+    "切换": ["切换", "跳转", "导航", "返回"]
+}
+# 关键词 -> (优先级, 操作类型)，一次扫描找出全部关键词后取优先级最高者
+_ACTION_TYPE_RANKS = {
+    keyword: (rank, action)
+    for rank, (action, keywords) in enumerate(_ACTION_TYPE_KEYWORDS.items())
+    for keyword in keywords
+}
+_ACTION_TYPE_RE = re.compile("|".join(_ACTION_TYPE_RANKS))
+
+# 需要前置条件步骤、准备步骤的场景关键词（设置/配置 两者都需要），一次扫描同时判断
+_STEP_NEEDS_RE = re.compile(
+    r'(?P<both>设置|配置)'
+    r'|(?P<precondition>登录|权限|打开|进入)'
+    r'|(?P<preparation>准备|选择|添加)'
+)
+
+# 场景名称的常见前缀、后缀词
+_SCENARIO_PREFIX_RE = re.compile(r'^(验证|测试|检查|确保)')
+_SCENARIO_SUFFIX_RE = re.compile(r'(的功能|的正确性|是否正常)$')
+
+# 场景复杂度指标，一次扫描同时统计动作和验证点
+# 验证/确认/检查 既是动作也是验证点，单独分组后按两者权重之和计分
+_COMPLEXITY_TOKEN_RE = re.compile(
+    r'(?P<check>验证|确认|检查)'
+    r'|(?P<action>输入|点击|选择|滑动|切换|查看)'
+    r'|(?P<validation>显示|提示)'
+)
+_COMPLEXITY_WEIGHTS = {
+    "check": 2 + 1,      # 动作 + 验证点
+    "action": 2,         # 动作数量权重最高
+    "validation": 1,     # 验证点
+}
+# 条件单独统计：贪婪的“在…情况下”会吞掉其范围内的其他条件词，不能并入上面的扫描
+_COMPLEXITY_CONDITION_RE = re.compile(r'如果|当|在.*情况下|需要|要求')
+_COMPLEXITY_CONDITION_WEIGHT = 1.5
+
+# 场景中的连续动作、关键操作和期望关键词
+_SEQUENCE_WORD_RE = re.compile(r'(然后|接着|再|继续)')
+_SCENARIO_OPERATION_RE = re.compile(r'(输入|点击|选择|滑动|切换|查看).*?[，。]')
+_SMART_ACTION_RE = re.compile(r'(输入|点击|选择|滑动|切换|查看|验证).*?[，。]')
+_EXPECTED_KEYWORD_RE = re.compile(r'(成功|正确|显示|跳转|提示|验证)')
+
+# 验证要点提取模式：零宽断言使各位置的匹配可以重叠，一次扫描得到每个动词的所有出现位置
+_VERIFICATION_POINT_RE = re.compile(r'(?=(验证|检查|确认)(.*?)(?:[，。]|$))')
+# 验证动词的优先级，越小越优先
+_VERIFICATION_VERB_RANKS = {"验证": 0, "检查": 1, "确认": 2}
+
+# 各复杂度在提示词中建议的步骤数量范围
+_STEP_RANGE_BY_COMPLEXITY = {"简单": "1-3", "中等": "2-4", "复杂": "3-6", "复合": "4-8"}
+
+# 各操作类型的模板化期望结果
+_EXPECTED_RESULT_TEMPLATES = {
+    "点击": "界面响应及时，功能执行正确",
+    "输入": "数据输入成功，格式验证正确",
+    "滑动": "页面滑动流畅，内容加载正常",
+    "查看": "信息显示完整，布局适配良好",
+    "切换": "页面跳转成功，状态保持正确",
+    "操作": "功能执行成功，用户体验良好"
+}
+
+# 各操作类型的模板化核心操作
+_SMART_ACTION_TEMPLATES = {
+    "点击": "点击相关按钮执行操作",
+    "输入": "在输入框中输入相关信息",
+    "滑动": "通过滑动手势进行操作",
+    "查看": "查看页面显示的内容",
+    "切换": "切换到目标状态或页面",
+    "操作": "执行相关功能操作"
+}
+
+# 各操作类型的模板化操作期望结果
+_SMART_EXPECTED_TEMPLATES = {
+    "点击": "按钮响应及时，操作执行成功",
+    "输入": "信息输入成功，格式验证通过",
+    "滑动": "页面滑动流畅，内容正常显示",
+    "查看": "信息显示完整，布局正确",
+    "切换": "状态切换成功，界面更新正确",
+    "操作": "功能执行成功，结果正确"
+}
+
+# 各操作类型的核心操作模板（按场景文本渲染）
+_CORE_ACTION_TEMPLATES = {
+    "点击": "点击相关按钮或元素，{scenario}",
+    "输入": "在输入框中{scenario}",
+    "滑动": "通过滑动手势{scenario}",
+    "查看": "查看页面内容，{scenario}",
+    "切换": "切换到目标状态，{scenario}",
+    "操作": "{scenario}"
+}
+
+# 各操作类型的操作期望结果
+_ACTION_EXPECTED_TEMPLATES = {
+    "点击": "按钮响应，相关操作执行",
+    "输入": "内容输入成功，格式验证通过",
+    "滑动": "页面滑动流畅，内容正常显示",
+    "查看": "信息显示完整，布局正确",
+    "切换": "状态切换成功，界面更新正确",
+    "操作": "操作执行成功"
+}
+
+# 完全模板化、视为低质量的步骤内容
+_LOW_QUALITY_PHRASES = frozenset(("执行操作", "检查结果"))
+
+# 高优先级（需要额外用例和验证步骤）
+_HIGH_PRIORITIES = frozenset((Priority.P0, Priority.P1))
+
+# 支持生成用例的测试类别
+_SUPPORTED_CATEGORIES = frozenset(category.value for category in TestCategory)
+
+# 各优先级最多保留的用例数，按 PRIORITY_RANKS 序号（P0、P1、P2、P3）排列
+_MAX_CASES_PER_PRIORITY = (3, 4, 2, 1)
+
+# 测试类别缩写（用于用例编号）
+_CATEGORY_ABBREVIATIONS = {
+    TestCategory.FUNCTIONAL: "功能",
+    TestCategory.COMPATIBILITY: "兼容",
+    TestCategory.USABILITY: "易用"
+}
+_CASE_ID_PREFIXES = {category: f"TC_{abbr}_" for category, abbr in _CATEGORY_ABBREVIATIONS.items()}
+
+# AI 提示词：固定说明作为系统提示词，用户提示词只包含随场景变化的内容，
+# 各次请求的消息前缀相同，服务端可复用前缀缓存
+_EXPECTED_RESULT_SYSTEM_PROMPT = """作为移动端测试专家，请为给出的测试场景生成具体、可验证的期望结果。
+
+要求:
+1. 期望结果要具体明确，可以验证
+2. 包含用户界面、数据状态、交互反馈等方面
+3. 避免模糊的描述，使用具体的验证点
+4. 长度控制在30字以内
+5. 体现移动端特色（如响应速度、界面适配等）
+
+请直接返回期望结果描述，不需要其他格式。"""
+
+_STEP_SYSTEM_PROMPT = """作为移动端测试专家，请为给出的测试场景生成具体、可执行的测试步骤。
+
+要求:
+1. 根据场景复杂度生成建议数量的测试步骤
+2. 每个步骤包含具体的操作和明确的期望结果
+3. 步骤要贴近真实的移动端使用场景
+4. 避免模板化语言，使用具体的操作描述
+5. 期望结果要具体可验证
+6. 步骤数量要合理，不要为了凑数而添加无意义的步骤
+
+请按以下JSON格式返回:
+{
+  "steps": [
+    {
+      "action": "具体的操作步骤描述",
+      "expected": "具体的期望结果"
+    }
+  ]
+}
+
+步骤数量指导:
+- 简单场景(如单一操作): 1-3步
+- 中等场景(如登录流程): 2-4步
+- 复杂场景(如购物流程): 3-6步
+- 复合场景(如多步骤验证): 4-8步
+
+请根据实际测试需要生成合适数量的步骤。"""
+
+# 步骤提示词中只依赖类别、优先级、复杂度的部分（渲染结果可缓存）
+_STEP_PROMPT_TAIL = """测试类别: {category}
+优先级: {priority}
+场景复杂度: {complexity}
+建议步骤数: {step_range}"""
+
+_COMPATIBILITY_PROMPT_HEAD = "作为移动端测试专家，请为以下功能生成兼容性测试步骤。\n\n"
+_COMPATIBILITY_PROMPT_TAIL = """测试类别: {category}
+功能复杂度: {complexity}
+
+要求:
+1. 根据功能复杂度生成{step_range}个兼容性测试步骤
+2. 重点关注移动端设备差异（屏幕尺寸、系统版本、横竖屏等）
+3. 每个步骤要具体可执行
+4. 期望结果要明确可验证
+5. 步骤数量要合理，避免为了凑数而添加无意义步骤
+
+兼容性测试重点:
+- 不同屏幕尺寸适配
+- 横竖屏切换
+- 不同系统版本
+- 不同设备性能
+- 网络环境差异
+
+请按以下JSON格式返回:
+{{
+  "steps": [
+    {{
+      "action": "具体的兼容性测试操作",
+      "expected": "具体的兼容性验证结果"
+    }}
+  ]
+}}"""
+
+_USABILITY_PROMPT_HEAD = "作为移动端用户体验专家，请为以下功能生成易用性测试步骤。\n\n"
+_USABILITY_PROMPT_TAIL = """测试类别: {category}
+功能复杂度: {complexity}
+
+要求:
+1. 根据功能复杂度生成{step_range}个易用性测试步骤
+2. 重点关注用户体验（操作便捷性、界面友好性、错误处理等）
+3. 从新用户角度考虑操作流程
+4. 每个步骤要具体可执行
+5. 步骤数量要合理，关注质量而非数量
+
+易用性测试重点:
+- 首次使用体验
+- 操作流程直观性
+- 错误提示友好性
+- 界面元素可用性
+- 交互反馈及时性
+
+请按以下JSON格式返回:
+{{
+  "steps": [
+    {{
+      "action": "具体的易用性测试操作",
+      "expected": "具体的用户体验验证结果"
+    }}
+  ]
+}}"""
+
+# 多个测试要点批量生成兼容性/易用性步骤的提示词（固定说明在前，要点列表追加在后）
+_CATEGORY_BATCH_PROMPT_FORMAT = """
+请按以下JSON格式返回，items 数组的顺序与功能编号一致:
+{
+  "items": [
+    {
+      "steps": [
+        {
+          "action": "具体的测试操作",
+          "expected": "具体的验证结果"
+        }
+      ]
+    }
+  ]
+}
+
+功能列表:
+"""
+_CATEGORY_BATCH_PROMPT_PREFIXES = {
+    "compatibility": """作为移动端测试专家，请为下面列出的每个功能分别生成兼容性测试步骤。
+
+要求:
+1. 按功能编号顺序，为每个功能分别生成测试步骤，步骤数量参考各功能后的建议
+2. 重点关注移动端设备差异（屏幕尺寸、系统版本、横竖屏等）
+3. 每个步骤要具体可执行，期望结果要明确可验证
+4. 步骤数量要合理，避免为了凑数而添加无意义步骤
+""" + _CATEGORY_BATCH_PROMPT_FORMAT,
+    "usability": """作为移动端用户体验专家，请为下面列出的每个功能分别生成易用性测试步骤。
+
+要求:
+1. 按功能编号顺序，为每个功能分别生成测试步骤，步骤数量参考各功能后的建议
+2. 重点关注用户体验（操作便捷性、界面友好性、错误处理等），从新用户角度考虑操作流程
+3. 每个步骤要具体可执行，期望结果要明确可验证
+4. 步骤数量要合理，关注质量而非数量
+""" + _CATEGORY_BATCH_PROMPT_FORMAT,
+}
+
+# 生成额外类别用例的测试类别及其AI请求类型
+_CATEGORY_CASE_KINDS = {
+    TestCategory.COMPATIBILITY: "compatibility",
+    TestCategory.USABILITY: "usability",
+}
+
+# 多场景批量生成步骤的提示词：固定说明放在开头，便于服务端复用相同前缀的缓存
+_BATCH_STEP_PROMPT_PREFIX = """作为移动端测试专家，请为下面列出的每个测试场景分别生成具体、可执行的测试步骤。
+
+要求:
+1. 按场景编号顺序，为每个场景分别生成测试步骤，步骤数量参考各场景后的建议
+2. 每个步骤包含具体的操作和明确的期望结果
+3. 步骤要贴近真实的移动端使用场景
+4. 避免模板化语言，使用具体的操作描述
+5. 期望结果要具体可验证
+6. 步骤数量要合理，不要为了凑数而添加无意义的步骤
+
+请按以下JSON格式返回，scenarios 数组的顺序与场景编号一致:
+{
+  "scenarios": [
+    {
+      "steps": [
+        {
+          "action": "具体的操作步骤描述",
+          "expected": "具体的期望结果"
+        }
+      ]
+    }
+  ]
+}
+
+"""
+
+# 用例标题分词
+_WORD_RE = re.compile(r'\w+')
+
+# 纯 ASCII 标题分词：非单词字符替换为空格后直接 split，结果与 _WORD_RE 一致
+_ASCII_NON_WORD_TABLE = str.maketrans({
+    c: " " for c in map(chr, range(128)) if not (c.isalnum() or c == "_")
+})
+
+# 批量分词：标题以分隔符拼接后一次扫描，分隔符本身也作为记号返回
+_TITLE_SEPARATOR = "\x1f"
+_BATCH_WORD_RE = re.compile(r'\w+|\x1f')
+_BATCH_SIGNATURE_THRESHOLD = 32
+
+# 优化用例时每次从生成管道取出的用例数（需大于批量签名阈值）
+_OPTIMIZE_CHUNK_SIZE = 256
+
+def _compile_keyword_rules(rules) -> Tuple[re.Pattern, Dict[str, Tuple[int, object]]]:
+    """把按优先级排列的 (关键词组, 结果) 规则编译为一个正则和关键词到 (序号, 结果) 的映射
+    
+    正则用前瞻在每个位置都尝试匹配，关键词互相重叠时也不会漏掉优先级更高的一个。
+    """
+    ranks = {}
+    for rank, (keywords, result) in enumerate(rules):
+        for keyword in keywords:
+            ranks.setdefault(keyword, (rank, result))
+    return re.compile("(?=(%s))" % "|".join(map(re.escape, ranks))), ranks
+
+
+def _match_keyword_rules(compiled_rules, text: str, default=None):
+    """一次扫描文本，返回命中的优先级最高的规则结果，未命中时返回 default"""
+    pattern, ranks = compiled_rules
+    matches = pattern.findall(text)
+    if not matches:
+        return default
+    return min(ranks[keyword] for keyword in matches)[1]
+
+
+# 主要操作步骤：先按操作类型分类，再按操作对象选取具体步骤 (操作, 期望结果)
+_MAIN_ACTION_TYPE_RULES = _compile_keyword_rules((
+    (("输入",), "输入"),
+    (("点击",), "点击"),
+    (("选择",), "选择"),
+    (("浏览",), "浏览"),
+    (("修改", "编辑"), "修改"),
+    (("保存",), "保存"),
+    (("滑动", "拖拽"), "滑动"),
+))
+_MAIN_ACTION_STEP_RULES = {
+    "输入": _compile_keyword_rules((
+        (("用户名",), ("在用户名输入框中输入有效的用户名", "用户名输入成功，字段显示正常")),
+        (("密码",), ("在密码输入框中输入正确的密码", "密码输入成功，显示为密文")),
+        (("关键词", "搜索"), ("在搜索框中输入商品关键词", "搜索词输入成功，搜索建议显示")),
+    )),
+    "点击": _compile_keyword_rules((
+        (("登录",), ("点击登录按钮", "登录请求发送，显示加载状态")),
+        (("搜索",), ("点击搜索按钮或按回车键", "搜索请求发送，开始加载结果")),
+        (("购物车", "加入"), ("点击加入购物车按钮", "商品添加成功，购物车图标更新")),
+        (("结算",), ("点击结算按钮", "跳转到结算页面，商品信息显示")),
+        (("支付",), ("点击支付按钮", "跳转到支付页面，显示支付金额和支付方式选项")),
+        (("保存",), ("点击保存按钮", "数据保存成功，显示保存确认提示")),
+        (("确认",), ("点击确认按钮", "操作确认执行，相关状态更新")),
+        (("取消",), ("点击取消按钮", "操作取消，返回上一步状态")),
+    )),
+    "选择": _compile_keyword_rules((
+        (("商品",), ("选择目标商品或商品规格", "商品高亮显示，规格选项展开，价格信息更新")),
+        (("地址",), ("选择收货地址", "地址被标记为选中状态，配送费用和时间更新")),
+        (("支付方式",), ("选择支付方式", "支付方式图标高亮，相关支付信息显示")),
+        (("类别", "分类"), ("选择商品类别", "类别被选中，相关商品筛选显示")),
+    )),
+    "修改": _compile_keyword_rules((
+        (("信息",), ("修改个人信息字段", "信息修改成功，字段内容更新")),
+    )),
+}
+# 没有更具体的操作对象时使用的固定步骤
+_MAIN_ACTION_DEFAULT_STEPS = {
+    "浏览": ("浏览页面内容和商品信息", "页面内容正常显示，图片加载完成"),
+    "修改": ("执行修改操作", "修改内容保存，界面更新"),
+    "保存": ("点击保存按钮确认修改", "保存操作执行，显示保存状态"),
+    "滑动": ("执行滑动或拖拽操作", "界面响应流畅，内容正常更新"),
+}
+
+# 场景分句的分隔符
+_SENTENCE_SPLIT_RE = re.compile(r'[，。；,;]|，然后|，接着|，再|，最后|，验证')
+
+# 提取关键词时移除的常见动词和助词
+_KEY_WORD_NOISE_RE = re.compile(r'(验证|检查|确认|测试|是否|能够|正确|成功)')
+
+# 应用上下文关键词，按匹配优先级排列
+_APP_CONTEXTS = ("主页", "首页", "登录页", "商品页", "购物车", "个人中心", "设置页")
+
+# 提取的输入内容、跳转页面、显示内容对应的完整步骤文本（取值固定，导入时拼好）
+_INPUT_ACTIONS = {
+    content: f"在相应字段输入{content}"
+    for content in ("用户名", "密码", "手机号码", "邮箱地址", "搜索关键词", "相关信息")
+}
+_TARGET_PAGE_EXPECTATIONS = {
+    page: f"成功跳转到{page}，页面内容加载完整"
+    for page in ("主页面", "详情页面", "结果页面", "目标页面")
+}
+_DISPLAY_EXPECTATIONS = {
+    content: f"正确显示{content}，布局整齐美观"
+    for content in ("错误提示信息", "成功提示信息", "操作结果", "相关内容")
+}
+
+# 句子没有业务上下文时，各操作类型的期望结果
+_GENERIC_CONTEXT_EXPECTATIONS = {
+    "点击": "界面响应迅速，相关功能模块激活，用户反馈明确",
+    "选择": "选项状态更新，相关信息联动显示，操作反馈及时",
+    "输入": "输入内容实时验证，格式提示友好，错误处理得当",
+    "滑动": "页面滑动流畅，内容加载及时，交互体验良好",
+}
+
+# 场景中的关键动作模式：(正则, 操作模板, 期望结果, 优先级)
+# 关键词均为中文，无需 IGNORECASE
+_SCENARIO_ACTION_PATTERNS = (
+    (re.compile(r"(打开|启动|进入).*?(应用|页面|界面|功能)"), "打开应用，进入{}", "页面加载完成，界面显示正常", 1),
+    (re.compile(r"输入.*?(用户名|密码|手机号|邮箱|信息|内容|关键词)"), "在相应输入框中输入{}", "信息输入成功，格式验证通过", 2),
+    (re.compile(r"点击.*?(按钮|链接|选项|图标|标签)"), "点击{}", "按钮响应，操作执行成功", 2),
+    (re.compile(r"(选择|勾选).*?(选项|商品|服务|类别)"), "选择{}", "选择成功，状态更新正确", 2),
+    (re.compile(r"(滑动|拖拽|滚动).*?(页面|列表|元素)"), "通过滑动操作{}", "滑动流畅，内容正常显示", 2),
+    (re.compile(r"验证.*?(显示|跳转|提示|结果|状态)"), "验证{}", "验证结果符合预期", 3),
+    (re.compile(r"(检查|确认|查看).*?(信息|内容|状态|结果)"), "检查{}", "信息显示正确，状态符合预期", 3),
+    (re.compile(r"(等待|观察).*?(加载|响应|变化)"), "等待{}", "系统响应正常，状态更新及时", 2),
+)
+
+
+# 从环境变量创建的 AI 提供者按 (提供商, 密钥) 共享，新建生成器时无需重复创建客户端
+_PROVIDER_CACHE: Dict[Tuple[str, str], AIModelProvider] = {}
+_PROVIDER_CACHE_LOCK = threading.Lock()
+
+
+def _get_shared_provider(provider_name: str, api_key: str) -> AIModelProvider:
+    """获取共享的 AI 提供者，不存在时创建"""
+    key = (provider_name, api_key)
+    with _PROVIDER_CACHE_LOCK:
+        provider = _PROVIDER_CACHE.get(key)
+        if provider is None:
+            provider = _PROVIDER_CACHE[key] = AIModelFactory.create_provider(provider_name, api_key)
+        return provider
+
+
+class ScenarioInfo(NamedTuple):
+    """场景分析结果"""
+    name: str
+    description: str
+    action_type: str
+    expected_result: str
+
+
+class ActionStep(NamedTuple):
+    """从场景句子提取的操作步骤"""
+    action: str
+    expected: str
+
+
+class ScenarioAction(NamedTuple):
+    """从场景识别的关键动作，priority 越小越靠前"""
+    action: str
+    expected: str
+    priority: int
+
+
+# 没有AI步骤时兼容性/易用性用例使用的默认步骤，每个用例按此创建各自的步骤对象
+_DEFAULT_COMPATIBILITY_STEPS = (
+    ActionStep("在不同屏幕尺寸的设备上打开功能页面", "页面布局自适应，元素显示完整"),
+    ActionStep("执行核心功能操作", "功能正常执行，无兼容性问题"),
+    ActionStep("切换横竖屏模式测试", "界面适配正确，功能保持正常"),
+)
+_DEFAULT_USABILITY_STEPS = (
+    ActionStep("首次使用该功能，观察操作引导", "操作流程清晰，引导信息明确"),
+    ActionStep("执行常见操作，注意交互反馈", "操作响应及时，反馈信息友好"),
+    ActionStep("测试错误操作的处理", "错误提示清晰，恢复操作简单"),
+)
+
+
+class StepLimits(NamedTuple):
+    """按复杂度生成步骤时的最少、最多步骤数"""
+    min: int
+    max: int
+
+
+# 各复杂度对应的步骤数量上下限
+_STEP_LIMITS_BY_COMPLEXITY = {
+    "简单": StepLimits(2, 3),
+    "中等": StepLimits(2, 5),
+    "复杂": StepLimits(3, 7),
+    "复合": StepLimits(4, 10),
+}
+_DEFAULT_STEP_LIMITS = StepLimits(2, 5)
+
+
+# 验证句子按关键词对应的具体验证内容，按匹配优先级排列
+_SPECIFIC_VERIFICATIONS = (
+    ("功能", ActionStep("功能可用性", "功能正常运行，响应及时，无异常错误")),
+    ("界面", ActionStep("界面显示效果", "界面布局合理，元素对齐，色彩搭配协调")),
+    ("数据", ActionStep("数据准确性", "数据内容准确，格式正确，实时同步")),
+    ("状态", ActionStep("系统状态", "状态显示正确，状态变化及时反馈")),
+    ("流程", ActionStep("业务流程", "流程执行顺畅，各环节衔接正常")),
+)
 
 
 class TestCaseGenerator:
     """移动C端测试用例生成器 - 重构版"""
-    
-    def __init__(self, ai_provider=None):
-        """初始化测试用例生成器"""
+
+    # 每个测试要点的场景用例上限，以及最多补充的类别用例数
+    MAX_SCENARIOS_PER_POINT = 3
+    MAX_CASES_PER_POINT = MAX_SCENARIOS_PER_POINT + 1
+    # 兼容性/易用性步骤每次批量请求的测试要点上限，避免响应超出 max_tokens 被截断
+    CATEGORY_BATCH_SIZE = 5
+
+    # 以下维度、操作、验证要点为只读配置，作为类属性由所有实例共享
+    # 移动端核心测试维度
+    mobile_dimensions = {
+        "基础功能": {
+            "weight": 0.6,  # 权重，决定生成用例的比例
+            "scenarios": ["正常操作", "数据验证", "状态切换"]
+        },
+        "网络环境": {
+            "weight": 0.2,
+            "scenarios": ["弱网环境", "网络切换", "离线状态"]
+        },
+        "设备适配": {
+            "weight": 0.15,
+            "scenarios": ["横竖屏切换", "不同屏幕尺寸", "系统版本差异"]
+        },
+        "异常处理": {
+            "weight": 0.05,
+            "scenarios": ["中断恢复", "错误输入", "边界条件"]
+        }
+    }
+    
+    # 移动端常见操作模式
+    mobile_actions = {
+        "点击": ["轻点", "长按", "双击"],
+        "滑动": ["上滑", "下滑", "左滑", "右滑"],
+        "输入": ["键盘输入", "语音输入", "复制粘贴"],
+        "导航": ["返回", "前进", "跳转", "刷新"]
+    }
+    
+    # 移动端验证要点
+    mobile_validations = {
+        "界面": ["布局正确", "元素显示", "响应及时"],
+        "数据": ["内容准确", "状态同步", "缓存有效"],
+        "交互": ["操作流畅", "反馈明确", "逻辑正确"]
+    }
+
+    # AI 响应结构化缓存的最大条目数
+    AI_CACHE_MAX_SIZE = 512
+
+    # 生成结果缓存的最大条目数（相同测试要点重复生成时直接复用）
+    RESULT_CACHE_MAX_SIZE = 16
+
+    # 单次 AI 请求提示词（含系统提示词）的最大字符数，超出时不请求、直接回退模板
+    AI_PROMPT_MAX_CHARS = 6000
+
+    def __init__(self, ai_provider=None, max_concurrency: int = 10,
+                 cache_manager: Optional[CacheManager] = None,
+                 force_ai_simple: bool = False):
+        """初始化测试用例生成器
+        
+        Args:
+            ai_provider: AI 模型提供者，为空时尝试从环境变量创建
+            max_concurrency: 启用 AI 时并发处理测试要点的最大线程数
+            cache_manager: 缓存管理器，用于持久化 AI 响应
+            force_ai_simple: 简单场景是否也使用AI生成步骤（默认使用模板）
+        """
         self.case_counter = 0
+        self.max_concurrency = max_concurrency
+        self.force_ai_simple = force_ai_simple
         self.logger = StructuredLogger("TestCaseGenerator")
+        self.cache_manager = cache_manager or CacheManager()
+        
+        # AI 响应缓存：结构相同的请求（类别、优先级、操作类型、场景等）复用已有响应
+        self._ai_cache: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._ai_cache_lock = threading.Lock()
+        
+        # 生成结果缓存：按测试要点内容的摘要保存优化后的用例
+        self._result_cache: "OrderedDict[str, List[FastTestCase]]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+        # 本次生成是否有 AI 请求失败（超时、空响应、提示词过长、响应无法解析）而回退模板，回退的结果不缓存
+        self._ai_fallback_used = False
+        
+        # 场景解析出的步骤只依赖场景文本，按场景缓存（线程安全、有上限）
+        self._scenario_step_pairs = lru_cache(maxsize=1024)(self._parse_scenario_step_pairs)
         
         # AI模型提供者
         self.ai_provider = ai_provider
         if not self.ai_provider:
             try:
                 # 尝试从环境变量获取API密钥
-                import os
                 api_key = os.getenv("OPENAI_API_KEY")
                 if api_key:
-                    self.ai_provider = AIModelFactory.create_provider("openai", api_key)
+                    self.ai_provider = _get_shared_provider("openai", api_key)
                     self.logger.info("成功初始化AI提供者")
                 else:
                     self.logger.info("未配置AI API密钥，将使用智能模板化生成")
@@ -39,53 +644,83 @@ class TestCaseGenerator:
             except Exception as e:
                 self.logger.warning(f"无法初始化AI提供者: {e}")
                 self.ai_provider = None
+
+    def generate_test_cases(self, test_points: Dict) -> List[Dict]:
+        """生成移动端测试用例 - 重构版"""
+        final_cases = self._generate_final_cases(test_points)
         
-        # 移动端核心测试维度
-        self.mobile_dimensions = {
-            "基础功能": {
-                "weight": 0.6,  # 权重，决定生成用例的比例
-                "scenarios": ["正常操作", "数据验证", "状态切换"]
-            },
-            "网络环境": {
-                "weight": 0.2,
-                "scenarios": ["弱网环境", "网络切换", "离线状态"]
-            },
-            "设备适配": {
-                "weight": 0.15,
-                "scenarios": ["横竖屏切换", "不同屏幕尺寸", "系统版本差异"]
-            },
-            "异常处理": {
-                "weight": 0.05,
-                "scenarios": ["中断恢复", "错误输入", "边界条件"]
-            }
-        }
+        # 转换为字典格式
+        result = [self._case_to_dict(case) for case in final_cases]
         
-        # 移动端常见操作模式
-        self.mobile_actions = {
-            "点击": ["轻点", "长按", "双击"],
-            "滑动": ["上滑", "下滑", "左滑", "右滑"],
-            "输入": ["键盘输入", "语音输入", "复制粘贴"],
-            "导航": ["返回", "前进", "跳转", "刷新"]
-        }
+        self.logger.log_operation("generate_test_cases_complete", total_cases=len(result))
+        return result
+    
+    def generate_test_cases_json(self, test_points: Dict) -> bytes:
+        """生成测试用例并直接序列化为 UTF-8 JSON 字节串
         
-        # 移动端验证要点
-        self.mobile_validations = {
-            "界面": ["布局正确", "元素显示", "响应及时"],
-            "数据": ["内容准确", "状态同步", "缓存有效"],
-            "交互": ["操作流畅", "反馈明确", "逻辑正确"]
-        }
+        字段与 generate_test_cases 的结果一致（枚举序列化为取值），
+        需要 JSON 的调用方无需先构造字典列表再自行序列化。
+        """
+        final_cases = self._generate_final_cases(test_points)
+        result = json_dumps([self._case_to_dict(case) for case in final_cases])
         
-
-    def generate_test_cases(self, test_points: Dict) -> List[Dict]:
-        """生成移动端测试用例 - 重构版"""
+        self.logger.log_operation("generate_test_cases_complete", total_cases=len(final_cases))
+        return result
+    
+    def _generate_final_cases(self, test_points: Dict) -> List[FastTestCase]:
+        """生成、编号并优化全部用例，测试要点内容相同时复用上次的结果"""
         feature_name = test_points.get("feature_name", "")
         self.logger.log_operation("generate_test_cases_start", feature_name=feature_name)
         
+        result_key = self._get_result_cache_key(test_points)
+        if result_key is not None:
+            with self._result_cache_lock:
+                cached_cases = self._result_cache.get(result_key)
+                if cached_cases is not None:
+                    self._result_cache.move_to_end(result_key)
+            if cached_cases is not None:
+                self.logger.info("使用缓存的测试用例生成结果")
+                return list(cached_cases)
+        
+        self._ai_fallback_used = False
+        final_cases = self._build_final_cases(test_points)
+        
+        if result_key is not None and not self._ai_fallback_used:
+            with self._result_cache_lock:
+                self._result_cache[result_key] = final_cases
+                if len(self._result_cache) > self.RESULT_CACHE_MAX_SIZE:
+                    self._result_cache.popitem(last=False)
+        return list(final_cases)
+    
+    def _get_result_cache_key(self, test_points: Dict) -> Optional[str]:
+        """计算生成配置（AI提供者、简单场景是否用AI）和测试要点内容的摘要
+        
+        包含无法序列化的对象时返回 None（不缓存）
+        """
+        try:
+            content = json.dumps(test_points, sort_keys=True, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return None
+        provider_key = self._get_provider_cache_key() if self.ai_provider else ""
+        content = f"{provider_key}\n{self.force_ai_simple}\n{content}"
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _build_final_cases(self, test_points: Dict) -> List[FastTestCase]:
+        """解析测试要点，生成、编号并优化全部用例"""
         self.case_counter = 0
-        all_cases = []
-        
-        test_point_list = test_points.get("test_points", [])
-        
+        test_point_list = self._parse_test_points(test_points.get("test_points", []))
+        if self.ai_provider:
+            self._prefetch_ai_responses(test_point_list)
+
+        # 生成、编号、去重串成惰性管道，不保留全部候选用例
+        cases = self._number_cases(self._map_test_points(test_point_list))
+
+        # 质量控制和去重
+        return self._optimize_test_cases(cases)
+    
+    def _parse_test_points(self, test_point_list: List) -> List[TestPoint]:
+        """解析测试要点，跳过不支持的类别和无效数据"""
+        parsed = []
         for test_point_dict in test_point_list:
             try:
                 # 如果是字典，先检查类别是否支持
@@ -93,35 +728,117 @@ class TestCaseGenerator:
                     if not self._is_supported_category(test_point_dict.get("category")):
                         self.logger.info(f"跳过不支持的测试类别: {test_point_dict.get('category')} - {test_point_dict.get('description', 'N/A')}")
                         continue
-                    test_point = TestPoint(**test_point_dict)
+                    parsed.append(TestPoint(**test_point_dict))
                 else:
-                    test_point = test_point_dict
-                
-                # 基于AI场景直接生成实用测试用例
-                cases = self._generate_practical_cases(test_point)
-                all_cases.extend(cases)
-                
+                    parsed.append(test_point_dict)
             except Exception as e:
                 self.logger.error(f"处理测试要点失败: {str(e)}")
+        return parsed
+    
+    def _prefetch_ai_responses(self, test_point_list: List[TestPoint]):
+        """并发预取所有测试要点的批量步骤、场景期望结果和类别用例步骤，写入内存缓存
+        
+        逐要点组装用例时这些请求直接命中缓存，不再在要点内部逐个串行等待；
+        结构相同的请求只提交一次。请求失败时各生成方法自行记录日志，
+        组装阶段会按原流程重新请求或回退到模板。
+        """
+        tasks = {}
+        for test_point in test_point_list:
+            scenarios = test_point.scenarios[:self.MAX_SCENARIOS_PER_POINT]
+            if not scenarios:
                 continue
+            tasks.setdefault(
+                ("batch_steps", test_point.category, test_point.priority, tuple(scenarios)),
+                (self._generate_ai_batch_steps, test_point, scenarios)
+            )
+            for scenario in scenarios:
+                action_type = self._analyze_scenario_text(scenario)[1]
+                tasks.setdefault(
+                    ("expected", action_type, self._normalize_scenario(scenario)),
+                    (self._generate_ai_expected_result, scenario, action_type)
+                )
         
-        # 质量控制和去重
-        final_cases = self._optimize_test_cases(all_cases)
+        # 兼容性/易用性用例的步骤按类型跨测试要点分组合并请求（每组至多 CATEGORY_BATCH_SIZE 个），
+        # 即使不并发也能减少请求次数，因此始终预取
+        batch_size = self.CATEGORY_BATCH_SIZE
+        category_tasks = [
+            (self._generate_ai_category_batch_steps, kind, category_points[start:start + batch_size])
+            for kind, category_points in self._collect_category_case_points(test_point_list).items()
+            for start in range(0, len(category_points), batch_size)
+        ]
         
-        # 转换为字典格式
-        result = [case.dict() for case in final_cases]
+        workers = min(self.max_concurrency, len(tasks) + len(category_tasks))
+        if workers <= 1:
+            for task in category_tasks:
+                task[0](*task[1:])
+            return
+        tasks.update((("batch_category", index), task) for index, task in enumerate(category_tasks))
         
-        self.logger.log_operation("generate_test_cases_complete", total_cases=len(result))
-        return result
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda task: task[0](*task[1:]), tasks.values()))
+    
+    def _map_test_points(self, test_point_list: List[TestPoint]):
+        """为每个测试要点生成用例，结果顺序与输入一致
+        
+        AI 调用以网络等待为主，启用 AI 时多个测试要点并发处理；
+        模板化生成是纯 CPU 计算，顺序执行即可。
+        """
+        workers = min(self.max_concurrency, len(test_point_list))
+        if not self.ai_provider or workers <= 1:
+            yield from map(self._generate_cases_safely, test_point_list)
+            return
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(self._generate_cases_safely, test_point_list)
+    
+    def _generate_cases_safely(self, test_point: TestPoint) -> List[FastTestCase]:
+        """生成单个测试要点的用例，失败时记录日志并返回空列表"""
+        try:
+            # 基于AI场景直接生成实用测试用例
+            return self._generate_practical_cases(test_point)
+        except Exception as e:
+            self.logger.error(f"处理测试要点失败: {str(e)}")
+            return []
+    
+    def _number_cases(self, case_groups: Iterable[List[FastTestCase]]) -> Iterator[FastTestCase]:
+        """按生成顺序为用例分配ID并逐个产出（并发生成后统一编号，保证ID稳定）"""
+        for cases in case_groups:
+            for case in cases:
+                self.case_counter += 1
+                case.test_case_id = self._get_case_id_prefix(case.category) + "%03d" % self.case_counter
+                yield case
     
-    def _generate_practical_cases(self, test_point: TestPoint) -> List[TestCase]:
+    @staticmethod
+    def _case_to_dict(case: FastTestCase) -> Dict:
+        """将用例转换为字典，字段与 TestCase.model_dump() 一致
+        
+        直接按字段取值构造字典（不含构造时缓存的辅助属性），无需经过模型校验和序列化。
+        """
+        return {
+            "test_case_id": case.test_case_id,
+            "title": case.title,
+            "category": case.category,
+            "priority": case.priority,
+            "case_type": case.case_type,
+            "steps": [
+                {"step_no": step.step_no, "action": step.action, "expected": step.expected}
+                for step in case.steps
+            ],
+            "expected_result": case.expected_result,
+            "description": case.description,
+        }
+    
+    def _generate_practical_cases(self, test_point: TestPoint) -> List[FastTestCase]:
         """基于测试要点生成实用的测试用例"""
         cases = []
         
         # 1. 基于AI场景生成核心用例（每个场景1个用例）
         if test_point.scenarios:
-            for i, scenario in enumerate(test_point.scenarios[:3]):  # 限制最多3个场景
-                case = self._create_scenario_based_case(test_point, scenario, i + 1)
+            scenarios = test_point.scenarios[:self.MAX_SCENARIOS_PER_POINT]
+            # 多个场景的AI步骤合并为一次请求
+            batch_steps = self._generate_ai_batch_steps(test_point, scenarios)
+            for i, scenario in enumerate(scenarios):
+                case = self._create_scenario_based_case(test_point, scenario, i + 1, batch_steps.get(i))
                 if case:
                     cases.append(case)
         
@@ -131,45 +848,203 @@ class TestCaseGenerator:
         
         return cases
     
-    def _create_scenario_based_case(self, test_point: TestPoint, scenario: str, index: int) -> Optional[TestCase]:
-        """基于AI场景创建测试用例"""
+    def _create_scenario_based_case(self, test_point: TestPoint, scenario: str, index: int,
+                                    ai_steps: Optional[List[FastTestStep]] = None) -> Optional[FastTestCase]:
+        """基于AI场景创建测试用例
+        
+        Args:
+            test_point: 测试要点
+            scenario: 场景描述
+            index: 场景序号
+            ai_steps: 批量请求中已生成的AI步骤，为空时单独生成
+        """
         case = self._create_base_case(test_point, f"场景{index}")
         
         # 从场景描述中提取关键信息
         scenario_info = self._analyze_scenario(scenario)
         
-        case.title = f"{test_point.description} - {scenario_info['name']}"
-        case.description = f"验证{scenario_info['description']}"
+        case.title = f"{test_point.description} - {scenario_info.name}"
+        case.description = f"验证{scenario_info.description}"
         
         # 生成贴近真实的测试步骤
-        case.steps = self._generate_realistic_steps(test_point, scenario_info)
+        case.steps = ai_steps or self._generate_realistic_steps(test_point, scenario_info)
         case.expected_result = self._generate_final_expected_result(test_point, scenario_info)
         
         return case
     
-    def _analyze_scenario(self, scenario: str) -> Dict:
+    def _generate_ai_batch_steps(self, test_point: TestPoint, scenarios: List[str]) -> Dict[int, List[FastTestStep]]:
+        """一次请求为测试要点的多个场景生成AI步骤
+        
+        Returns:
+            场景下标到测试步骤的映射，未能生成的场景不在其中
+        """
+        if not self.ai_provider:
+            return {}
+        
+        # 只有需要AI步骤的场景参与批量请求（简单场景直接使用模板）
+        indexed = [
+            (i, scenario, self._analyze_scenario_complexity(scenario))
+            for i, scenario in enumerate(scenarios)
+        ]
+        if not self.force_ai_simple:
+            indexed = [item for item in indexed if item[2] != "简单"]
+        
+        # 单个场景沿用逐场景请求，可命中结构化缓存
+        if len(indexed) < 2:
+            return {}
+        
+        try:
+            prompt = self._build_batch_step_prompt(test_point, indexed)
+            cache_key = (
+                "batch_steps",
+                test_point.category.value,
+                test_point.priority.value,
+                tuple((self._normalize_scenario(scenario), complexity) for _, scenario, complexity in indexed),
+            )
+            response = self._cached_ai_chat(cache_key, prompt, is_complete=self._has_complete_json)
+            
+            if response and response.strip():
+                steps_list = self._parse_ai_batch_steps_response(response)
+                batch_steps = {
+                    i: self._create_steps_from_ai_data(steps_data)
+                    for (i, _, _), steps_data in zip(indexed, steps_list)
+                    if steps_data
+                }
+                # 响应无法解析或缺少部分场景时视为回退，本次结果不缓存
+                if len(batch_steps) < len(indexed):
+                    self._ai_fallback_used = True
+                return batch_steps
+        except Exception as e:
+            self.logger.warning(f"AI批量步骤生成失败: {e}")
+        
+        return {}
+    
+    def _build_batch_step_prompt(self, test_point: TestPoint, indexed: List[Tuple[int, str, str]]) -> str:
+        """构建多场景步骤生成提示词"""
+        parts = [
+            _BATCH_STEP_PROMPT_PREFIX,
+            f"测试要点: {test_point.description}\n"
+            f"测试类别: {test_point.category.value}\n"
+            f"优先级: {test_point.priority.value}\n\n"
+            "测试场景:\n",
+        ]
+        parts.extend(
+            f"[{number}] {scenario}（复杂度: {complexity}，{self._get_step_range_by_complexity(complexity)}步）\n"
+            for number, (_, scenario, complexity) in enumerate(indexed, 1)
+        )
+        return "".join(parts)
+    
+    def _parse_ai_batch_steps_response(self, response: str, key: str = "scenarios") -> List[Optional[List[Dict]]]:
+        """解析批量步骤响应，按 key 数组的顺序返回各项的有效步骤"""
+        try:
+            data = parse_json_object(response)
+            if data is None:
+                return []
+            
+            items = data.get(key, [])
+            if not isinstance(items, list):
+                return []
+            
+            return [
+                self._filter_valid_steps(item.get("steps")) if isinstance(item, dict) else None
+                for item in items
+            ]
+            
+        except Exception as e:
+            self.logger.warning(f"解析AI批量步骤响应失败: {e}")
+            return []
+    
+    def _collect_category_case_points(self, test_point_list: List[TestPoint]) -> Dict[str, List[TestPoint]]:
+        """按请求类型收集需要AI生成类别用例步骤的测试要点（描述相同的只保留一个）"""
+        collected = {}
+        for test_point in test_point_list:
+            kind = _CATEGORY_CASE_KINDS.get(test_point.category)
+            if kind is None or test_point.priority not in _HIGH_PRIORITIES:
+                continue
+            collected.setdefault(kind, {}).setdefault(test_point.description, test_point)
+        return {kind: list(points.values()) for kind, points in collected.items()}
+    
+    def _generate_ai_category_batch_steps(self, kind: str, test_points: List[TestPoint]):
+        """一次请求为多个测试要点生成兼容性/易用性步骤
+        
+        各要点的步骤按逐要点请求的缓存键写入AI响应缓存，组装用例时直接命中；
+        只有一个要点或批量响应中缺失的要点仍按原流程单独请求。
+        """
+        if len(test_points) < 2:
+            return
+        
+        try:
+            items = [(test_point, self._analyze_scenario_complexity(test_point.description)) for test_point in test_points]
+            parts = [_CATEGORY_BATCH_PROMPT_PREFIXES[kind]]
+            parts.extend(
+                f"[{number}] {test_point.description}（测试类别: {test_point.category.value}，"
+                f"复杂度: {complexity}，{self._get_step_range_by_complexity(complexity)}步）\n"
+                for number, (test_point, complexity) in enumerate(items, 1)
+            )
+            cache_key = (
+                "batch_" + kind,
+                tuple((test_point.category.value, test_point.description, complexity) for test_point, complexity in items),
+            )
+            response = self._cached_ai_chat(cache_key, "".join(parts), is_complete=self._has_complete_json)
+            
+            if response and response.strip():
+                steps_list = self._parse_ai_batch_steps_response(response, "items")
+                remembered = 0
+                for (test_point, complexity), steps_data in zip(items, steps_list):
+                    if steps_data:
+                        self._remember_ai_response(
+                            (kind, test_point.category.value, test_point.description, complexity),
+                            json_dumps({"steps": steps_data}).decode("utf-8")
+                        )
+                        remembered += 1
+                # 响应无法解析或缺少部分要点时视为回退，本次结果不缓存
+                if remembered < len(items):
+                    self._ai_fallback_used = True
+        except Exception as e:
+            self.logger.warning(f"AI批量类别步骤生成失败: {e}")
+    
+    def _analyze_scenario(self, scenario: str) -> ScenarioInfo:
         """分析AI生成的场景，提取关键信息"""
-        # 简化场景名称
-        name = self._extract_scenario_name(scenario)
+        # 未启用AI时结果只依赖场景文本，整体缓存
+        if not self.ai_provider:
+            return self._analyze_template_scenario(scenario)
         
-        # 识别操作类型
-        action_type = self._identify_action_type(scenario)
+        # 简化场景名称、识别操作类型（只依赖场景文本，结果可缓存）
+        name, action_type = self._analyze_scenario_text(scenario)
         
-        # 生成期望结果
+        # 生成期望结果（调用AI，由AI响应缓存复用）
         expected_result = self._generate_expected_result(scenario, action_type)
         
-        return {
-            "name": name,
-            "description": scenario,
-            "action_type": action_type,
-            "expected_result": expected_result
-        }
+        return ScenarioInfo(name, scenario, action_type, expected_result)
+    
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _analyze_template_scenario(scenario: str) -> ScenarioInfo:
+        """不使用AI时的场景分析，ScenarioInfo 不可变，重复出现的场景直接复用"""
+        name, action_type = TestCaseGenerator._analyze_scenario_text(scenario)
+        expected_result = _EXPECTED_RESULT_TEMPLATES.get(action_type, "功能正常，符合预期")
+        return ScenarioInfo(name, scenario, action_type, expected_result)
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _analyze_scenario_text(scenario: str) -> Tuple[str, str]:
+        """提取场景名称和操作类型，重复出现的场景直接命中缓存"""
+        return (
+            TestCaseGenerator._extract_scenario_name(scenario),
+            TestCaseGenerator._identify_action_type(scenario)
+        )
     
-    def _extract_scenario_name(self, scenario: str) -> str:
+    @staticmethod
+    def _normalize_scenario(scenario: str) -> str:
+        """移除场景描述中常见的前后缀词，得到场景主体"""
+        name = _SCENARIO_PREFIX_RE.sub('', scenario)
+        return _SCENARIO_SUFFIX_RE.sub('', name)
+    
+    @staticmethod
+    def _extract_scenario_name(scenario: str) -> str:
         """从场景描述中提取简洁的名称"""
         # 移除常见的前缀词
-        name = re.sub(r'^(验证|测试|检查|确保)', '', scenario)
-        name = re.sub(r'(的功能|的正确性|是否正常)$', '', name)
+        name = TestCaseGenerator._normalize_scenario(scenario)
         
         # 限制长度
         if len(name) > 15:
@@ -177,21 +1052,15 @@ class TestCaseGenerator:
         
         return name.strip() or "基础功能"
     
-    def _identify_action_type(self, scenario: str) -> str:
+    @staticmethod
+    def _identify_action_type(scenario: str) -> str:
         """识别场景中的主要操作类型"""
-        action_keywords = {
-            "点击": ["点击", "按下", "选择", "触摸"],
-            "输入": ["输入", "填写", "编辑", "修改"],
-            "滑动": ["滑动", "拖拽", "滚动", "翻页"],
-            "查看": ["查看", "显示", "展示", "浏览"],
-            "切换": ["切换", "跳转", "导航", "返回"]
-        }
-        
-        for action, keywords in action_keywords.items():
-            if any(keyword in scenario for keyword in keywords):
-                return action
+        matches = _ACTION_TYPE_RE.findall(scenario)
+        if not matches:
+            return "操作"
         
-        return "操作"
+        # 多个操作类型同时出现时，按优先级取第一个
+        return min(_ACTION_TYPE_RANKS[keyword] for keyword in matches)[1]
     
     def _generate_expected_result(self, scenario: str, action_type: str) -> str:
         """根据场景和操作类型生成期望结果"""
@@ -200,40 +1069,28 @@ class TestCaseGenerator:
             ai_result = self._generate_ai_expected_result(scenario, action_type)
             if ai_result:
                 return ai_result
+            self._ai_fallback_used = True
         
         # 回退到模板化结果
-        result_templates = {
-            "点击": "界面响应及时，功能执行正确",
-            "输入": "数据输入成功，格式验证正确",
-            "滑动": "页面滑动流畅，内容加载正常",
-            "查看": "信息显示完整，布局适配良好",
-            "切换": "页面跳转成功，状态保持正确",
-            "操作": "功能执行成功，用户体验良好"
-        }
-        
-        return result_templates.get(action_type, "功能正常，符合预期")
+        return _EXPECTED_RESULT_TEMPLATES.get(action_type, "功能正常，符合预期")
     
     def _generate_ai_expected_result(self, scenario: str, action_type: str) -> Optional[str]:
         """使用AI生成具体的期望结果"""
+        # 空场景没有可供模型补充的内容
+        if not scenario.strip():
+            return None
+        
         try:
-            prompt = f"""作为移动端测试专家，请为以下测试场景生成具体、可验证的期望结果。
-
-测试场景: {scenario}
-操作类型: {action_type}
-
-要求:
-1. 期望结果要具体明确，可以验证
-2. 包含用户界面、数据状态、交互反馈等方面
-3. 避免模糊的描述，使用具体的验证点
-4. 长度控制在30字以内
-5. 体现移动端特色（如响应速度、界面适配等）
-
-请直接返回期望结果描述，不需要其他格式："""
-
-            response = self.ai_provider.chat(prompt)
+            prompt = f"测试场景: {scenario}\n操作类型: {action_type}"
+            cache_key = ("expected", action_type, self._normalize_scenario(scenario))
+            # 期望结果为单行文本，收到换行即可结束
+            response = self._cached_ai_chat(
+                cache_key, prompt, is_complete=self._has_complete_line,
+                system_prompt=_EXPECTED_RESULT_SYSTEM_PROMPT
+            )
             
             if response and response.strip():
-                result = response.strip()
+                result = response.strip().split("\n", 1)[0].strip()
                 # 长度控制
                 if len(result) > 50:
                     result = result[:47] + "..."
@@ -244,90 +1101,182 @@ class TestCaseGenerator:
         
         return None
     
-    def _generate_realistic_steps(self, test_point: TestPoint, scenario_info: Dict) -> List[TestStep]:
+    def _cached_ai_chat(self, cache_key: Tuple, prompt: str, is_complete=None,
+                        system_prompt: Optional[str] = None) -> str:
+        """调用AI模型，结构相同的请求直接复用缓存的响应
+        
+        相同提示词的响应同时写入磁盘缓存，跨运行复用。
+        
+        Args:
+            cache_key: 由请求的结构化特征组成的缓存键
+            prompt: 提示词
+            is_complete: 可选的判断函数，流式接收时内容已足够则提前结束
+            system_prompt: 可选的系统提示词（固定说明），为空时使用提供者默认值
+            
+        Returns:
+            AI 响应文本，提示词超出 AI_PROMPT_MAX_CHARS 时为空字符串
+        """
+        with self._ai_cache_lock:
+            cached = self._ai_cache.get(cache_key)
+            if cached is not None:
+                self._ai_cache.move_to_end(cache_key)
+                return cached
+        
+        # 提示词过长（场景文本异常）时请求大概率被截断或拒绝，不再发出
+        prompt_chars = len(prompt) + len(system_prompt or "")
+        if prompt_chars > self.AI_PROMPT_MAX_CHARS:
+            self.logger.warning(f"AI提示词过长（{prompt_chars} 字符），跳过AI生成")
+            self._ai_fallback_used = True
+            return ""
+        
+        # 内存未命中时查找磁盘缓存，重复运行同一功能时无需再次请求
+        provider_key = self._get_provider_cache_key()
+        disk_key = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        try:
+            response = self.cache_manager.get_prompt_cache(disk_key, provider_key)
+        except Exception as e:
+            self.logger.warning(f"读取AI响应磁盘缓存失败: {e}")
+            response = None
+        
+        if response is None:
+            chat_kwargs = {"system_prompt": system_prompt} if system_prompt else {}
+            try:
+                if is_complete and isinstance(self.ai_provider, AIModelProvider):
+                    response = self._stream_ai_chat(prompt, is_complete, **chat_kwargs)
+                else:
+                    response = self.ai_provider.chat(prompt, **chat_kwargs)
+            except Exception:
+                # 调用方捕获异常后回退模板
+                self._ai_fallback_used = True
+                raise
+            
+            # 只缓存有效响应，空响应下次仍重新请求；写缓存失败不影响已获得的响应
+            if response and response.strip():
+                try:
+                    self.cache_manager.set_prompt_cache(disk_key, provider_key, response)
+                except Exception as e:
+                    self.logger.warning(f"写入AI响应磁盘缓存失败: {e}")
+        
+        if response and response.strip():
+            self._remember_ai_response(cache_key, response)
+        else:
+            self._ai_fallback_used = True
+        
+        return response
+    
+    def _get_provider_cache_key(self) -> str:
+        """AI提供者的缓存标识：类型、接口地址和模型名，不同接口的响应不共用缓存"""
+        provider = self.ai_provider
+        return "|".join((
+            type(provider).__name__,
+            str(getattr(provider, "base_url", None) or ""),
+            str(getattr(provider, "model_name", None) or ""),
+        ))
+    
+    def _remember_ai_response(self, cache_key: Tuple, response: str):
+        """写入内存中的AI响应缓存，超出上限时淘汰最久未使用的条目"""
+        with self._ai_cache_lock:
+            self._ai_cache[cache_key] = response
+            if len(self._ai_cache) > self.AI_CACHE_MAX_SIZE:
+                self._ai_cache.popitem(last=False)
+    
+    def _stream_ai_chat(self, prompt: str, is_complete, **chat_kwargs) -> str:
+        """流式接收AI响应，所需内容接收完整后立即断开，省去剩余输出的等待"""
+        buffer = io.StringIO()
+        stream = self.ai_provider.chat_stream(prompt, **chat_kwargs)
+        try:
+            for chunk in stream:
+                buffer.write(chunk)
+                if is_complete(chunk, buffer):
+                    break
+        finally:
+            stream.close()
+        return buffer.getvalue()
+    
+    @staticmethod
+    def _has_complete_line(chunk: str, buffer: io.StringIO) -> bool:
+        """已收到一行非空内容（非空内容之后出现换行）"""
+        return "\n" in chunk and buffer.getvalue().lstrip().find("\n") > 0
+    
+    @staticmethod
+    def _has_complete_json(chunk: str, buffer: io.StringIO) -> bool:
+        """已收到一个完整的 JSON 对象"""
+        return "}" in chunk and extract_json_object(buffer.getvalue()) is not None
+    
+    def _generate_realistic_steps(self, test_point: TestPoint, scenario_info: ScenarioInfo) -> List[FastTestStep]:
         """生成贴近真实的测试步骤"""
-        # 优先使用AI优化步骤
-        if self.ai_provider:
+        # 优先使用AI优化步骤；简单场景模板步骤已足够，不再调用AI
+        if self.ai_provider and (
+            self.force_ai_simple
+            or self._analyze_scenario_complexity(scenario_info.description) != "简单"
+        ):
             ai_steps = self._generate_ai_optimized_steps(test_point, scenario_info)
             if ai_steps:
                 return ai_steps
+            self._ai_fallback_used = True
         
         # 回退到模板化步骤
         return self._generate_template_steps(test_point, scenario_info)
     
-    def _generate_ai_optimized_steps(self, test_point: TestPoint, scenario_info: Dict) -> Optional[List[TestStep]]:
+    def _generate_ai_optimized_steps(self, test_point: TestPoint, scenario_info: ScenarioInfo) -> Optional[List[FastTestStep]]:
         """使用AI生成优化的测试步骤"""
         try:
-            prompt = self._build_step_optimization_prompt(test_point, scenario_info)
-            response = self.ai_provider.chat(prompt)
-            
-            if response and response.strip():
-                steps_data = self._parse_ai_steps_response(response)
-                if steps_data:
-                    return self._create_steps_from_ai_data(steps_data)
-            
-        except Exception as e:
-            self.logger.warning(f"AI步骤生成失败: {e}")
-        
-        return None
-    
-    def _build_step_optimization_prompt(self, test_point: TestPoint, scenario_info: Dict) -> str:
-        """构建AI步骤优化提示词"""
-        # 根据场景复杂度动态确定步骤数量范围
-        complexity = self._analyze_scenario_complexity(scenario_info['description'])
-        step_range = self._get_step_range_by_complexity(complexity)
-        
-        return f"""作为移动端测试专家，请为以下测试场景生成具体、可执行的测试步骤。
-
-测试要点: {test_point.description}
-测试场景: {scenario_info['description']}
-测试类别: {test_point.category.value}
-优先级: {test_point.priority.value}
-场景复杂度: {complexity}
-
-要求:
-1. 根据场景复杂度生成{step_range}个测试步骤
-2. 每个步骤包含具体的操作和明确的期望结果
-3. 步骤要贴近真实的移动端使用场景
-4. 避免模板化语言，使用具体的操作描述
-5. 期望结果要具体可验证
-6. 步骤数量要合理，不要为了凑数而添加无意义的步骤
-
-请按以下JSON格式返回:
-{{
-  "steps": [
-    {{
-      "action": "具体的操作步骤描述",
-      "expected": "具体的期望结果"
-    }}
-  ]
-}}
-
-步骤数量指导:
-- 简单场景(如单一操作): 1-3步
-- 中等场景(如登录流程): 2-4步
-- 复杂场景(如购物流程): 3-6步
-- 复合场景(如多步骤验证): 4-8步
-
-请根据实际测试需要生成合适数量的步骤:"""
-    
-    def _analyze_scenario_complexity(self, scenario: str) -> str:
-        """分析场景复杂度"""
-        # 计算复杂度指标
-        action_count = len(re.findall(r'(输入|点击|选择|滑动|切换|查看|验证|确认|检查)', scenario))
-        condition_count = len(re.findall(r'(如果|当|在.*情况下|需要|要求)', scenario))
-        validation_count = len(re.findall(r'(验证|确认|检查|显示|提示)', scenario))
-        
-        # 场景长度
-        scenario_length = len(scenario)
+            prompt = self._build_step_optimization_prompt(test_point, scenario_info)
+            cache_key = (
+                "steps",
+                test_point.category.value,
+                test_point.priority.value,
+                scenario_info.action_type,
+                self._normalize_scenario(scenario_info.description),
+                self._analyze_scenario_complexity(scenario_info.description),
+            )
+            response = self._cached_ai_chat(
+                cache_key, prompt, is_complete=self._has_complete_json,
+                system_prompt=_STEP_SYSTEM_PROMPT
+            )
+            
+            if response and response.strip():
+                steps_data = self._parse_ai_steps_response(response)
+                if steps_data:
+                    return self._create_steps_from_ai_data(steps_data)
+            
+        except Exception as e:
+            self.logger.warning(f"AI步骤生成失败: {e}")
         
-        # 复杂度评分
-        complexity_score = (
-            action_count * 2 +           # 动作数量权重最高
-            condition_count * 1.5 +      # 条件判断
-            validation_count * 1 +       # 验证点
-            scenario_length / 20         # 场景长度
+        return None
+    
+    def _build_step_optimization_prompt(self, test_point: TestPoint, scenario_info: ScenarioInfo) -> str:
+        """构建AI步骤优化提示词"""
+        # 根据场景复杂度动态确定步骤数量范围
+        complexity = self._analyze_scenario_complexity(scenario_info.description)
+        
+        return "".join([
+            f"测试要点: {test_point.description}\n测试场景: {scenario_info.description}\n",
+            self._render_step_prompt_tail(test_point.category.value, test_point.priority.value, complexity),
+        ])
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _render_step_prompt_tail(category: str, priority: str, complexity: str) -> str:
+        """渲染提示词中只依赖类别、优先级和复杂度的部分，相同组合直接复用"""
+        return _STEP_PROMPT_TAIL.format(
+            category=category,
+            priority=priority,
+            complexity=complexity,
+            step_range=TestCaseGenerator._get_step_range_by_complexity(complexity)
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _analyze_scenario_complexity(scenario: str) -> str:
+        """分析场景复杂度（只依赖场景文本，同一场景的多次调用直接命中缓存）"""
+        # 复杂度评分：动作、条件、验证点加权计数，再加上场景长度
+        complexity_score = sum(
+            _COMPLEXITY_WEIGHTS[match.lastgroup]
+            for match in _COMPLEXITY_TOKEN_RE.finditer(scenario)
         )
+        complexity_score += len(_COMPLEXITY_CONDITION_RE.findall(scenario)) * _COMPLEXITY_CONDITION_WEIGHT
+        complexity_score += len(scenario) / 20
         
         # 分类复杂度
         if complexity_score <= 4:
@@ -339,61 +1288,50 @@ class TestCaseGenerator:
         else:
             return "复合"
     
-    def _get_step_range_by_complexity(self, complexity: str) -> str:
+    @staticmethod
+    def _get_step_range_by_complexity(complexity: str) -> str:
         """根据复杂度获取步骤数量范围"""
-        ranges = {
-            "简单": "1-3",
-            "中等": "2-4", 
-            "复杂": "3-6",
-            "复合": "4-8"
-        }
-        return ranges.get(complexity, "3-5")
+        return _STEP_RANGE_BY_COMPLEXITY.get(complexity, "3-5")
     
     def _parse_ai_steps_response(self, response: str) -> Optional[List[Dict]]:
         """解析AI返回的步骤数据"""
         try:
-            # 提取JSON内容
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if not json_match:
-                return None
-            
-            json_str = json_match.group()
-            data = json.loads(json_str)
-            
-            steps = data.get("steps", [])
-            if not steps or not isinstance(steps, list):
+            # 提取并解析JSON内容
+            data = parse_json_object(response)
+            if data is None:
                 return None
             
-            # 验证步骤格式
-            valid_steps = []
-            for step in steps:
-                if isinstance(step, dict) and "action" in step and "expected" in step:
-                    if step["action"].strip() and step["expected"].strip():
-                        valid_steps.append(step)
-            
-            return valid_steps if valid_steps else None
+            return self._filter_valid_steps(data.get("steps", []))
             
         except Exception as e:
             self.logger.warning(f"解析AI步骤响应失败: {e}")
             return None
     
-    def _create_steps_from_ai_data(self, steps_data: List[Dict]) -> List[TestStep]:
-        """从AI数据创建测试步骤对象"""
-        steps = []
-        for i, step_data in enumerate(steps_data, 1):
-            step = TestStep(
-                step_no=i,
-                action=step_data["action"].strip(),
-                expected=step_data["expected"].strip()
-            )
-            steps.append(step)
+    @staticmethod
+    def _filter_valid_steps(steps) -> Optional[List[Dict]]:
+        """过滤出包含非空操作和期望结果的步骤，没有有效步骤时返回 None"""
+        if not steps or not isinstance(steps, list):
+            return None
+        
+        valid_steps = [
+            step for step in steps
+            if isinstance(step, dict) and "action" in step and "expected" in step
+            and step["action"].strip() and step["expected"].strip()
+        ]
         
-        return steps
+        return valid_steps if valid_steps else None
+    
+    def _create_steps_from_ai_data(self, steps_data: List[Dict]) -> List[FastTestStep]:
+        """从AI数据创建测试步骤对象"""
+        return [
+            FastTestStep(step_no=i, action=step_data["action"].strip(), expected=step_data["expected"].strip())
+            for i, step_data in enumerate(steps_data, 1)
+        ]
     
-    def _generate_template_steps(self, test_point: TestPoint, scenario_info: Dict) -> List[TestStep]:
+    def _generate_template_steps(self, test_point: TestPoint, scenario_info: ScenarioInfo) -> List[FastTestStep]:
         """生成智能模板化的测试步骤（回退方案）"""
         steps = []
-        scenario = scenario_info["description"]
+        scenario = scenario_info.description
         
         # 从场景中提取关键信息来生成更具体的步骤
         extracted_steps = self._extract_steps_from_scenario(scenario, test_point)
@@ -404,134 +1342,69 @@ class TestCaseGenerator:
         # 如果提取失败，使用基础模板
         return self._generate_basic_template_steps(test_point, scenario_info)
     
-    def _extract_steps_from_scenario(self, scenario: str, test_point: TestPoint) -> Optional[List[TestStep]]:
+    def _extract_steps_from_scenario(self, scenario: str, test_point: TestPoint) -> Optional[List[FastTestStep]]:
         """从场景描述中智能提取测试步骤"""
+        step_pairs = self._scenario_step_pairs(scenario)
+        if not step_pairs:
+            return None
+        
+        # 缓存中只保存文本，每个用例创建各自的步骤对象
+        return self._build_steps(step_pairs)
+    
+    def _parse_scenario_step_pairs(self, scenario: str) -> Optional[Tuple[ActionStep, ...]]:
+        """解析场景并去重，返回 (操作, 期望结果) 序列，不足2步时返回 None"""
         # 使用更智能的场景解析
         parsed_scenario = self._parse_scenario_structure(scenario)
         
         if not parsed_scenario:
             return None
         
-        steps = []
-        step_no = 1
+        # 按前置条件、主要操作、验证点的顺序合并，并按操作前30个字符去重
+        step_pairs = []
         seen_actions = set()
+        for group in ("preconditions", "main_actions", "validations"):
+            for action_info in parsed_scenario[group]:
+                action_key = action_info.action[:30]
+                if action_key not in seen_actions:
+                    seen_actions.add(action_key)
+                    step_pairs.append(action_info)
         
-        # 合并所有步骤并去重
-        all_actions = []
-        if parsed_scenario.get("preconditions"):
-            all_actions.extend(parsed_scenario["preconditions"])
-        if parsed_scenario.get("main_actions"):
-            all_actions.extend(parsed_scenario["main_actions"])
-        if parsed_scenario.get("validations"):
-            all_actions.extend(parsed_scenario["validations"])
-        
-        # 生成去重的步骤
-        for action_info in all_actions:
-            action_key = action_info["action"][:30]  # 使用前30个字符作为去重键
-            if action_key not in seen_actions:
-                seen_actions.add(action_key)
-                step = TestStep(
-                    step_no=step_no,
-                    action=action_info["action"],
-                    expected=action_info["expected"]
-                )
-                steps.append(step)
-                step_no += 1
-        
-        return steps if len(steps) >= 2 else None
+        return tuple(step_pairs) if len(step_pairs) >= 2 else None
     
-    def _identify_scenario_actions(self, scenario: str, complexity: str = "中等") -> List[Dict]:
+    def _identify_scenario_actions(self, scenario: str, complexity: str = "中等") -> List[ScenarioAction]:
         """识别场景中的关键动作"""
         actions = []
         
-        # 扩展的动作模式，支持更多场景
-        action_patterns = [
-            {
-                "pattern": r"(打开|启动|进入).*?(应用|页面|界面|功能)",
-                "action_template": "打开应用，进入{}",
-                "expected": "页面加载完成，界面显示正常",
-                "priority": 1
-            },
-            {
-                "pattern": r"输入.*?(用户名|密码|手机号|邮箱|信息|内容|关键词)",
-                "action_template": "在相应输入框中输入{}",
-                "expected": "信息输入成功，格式验证通过",
-                "priority": 2
-            },
-            {
-                "pattern": r"点击.*?(按钮|链接|选项|图标|标签)",
-                "action_template": "点击{}",
-                "expected": "按钮响应，操作执行成功",
-                "priority": 2
-            },
-            {
-                "pattern": r"(选择|勾选).*?(选项|商品|服务|类别)",
-                "action_template": "选择{}",
-                "expected": "选择成功，状态更新正确",
-                "priority": 2
-            },
-            {
-                "pattern": r"(滑动|拖拽|滚动).*?(页面|列表|元素)",
-                "action_template": "通过滑动操作{}",
-                "expected": "滑动流畅，内容正常显示",
-                "priority": 2
-            },
-            {
-                "pattern": r"验证.*?(显示|跳转|提示|结果|状态)",
-                "action_template": "验证{}",
-                "expected": "验证结果符合预期",
-                "priority": 3
-            },
-            {
-                "pattern": r"(检查|确认|查看).*?(信息|内容|状态|结果)",
-                "action_template": "检查{}",
-                "expected": "信息显示正确，状态符合预期",
-                "priority": 3
-            },
-            {
-                "pattern": r"(等待|观察).*?(加载|响应|变化)",
-                "action_template": "等待{}",
-                "expected": "系统响应正常，状态更新及时",
-                "priority": 2
-            }
-        ]
-        
         # 提取动作
-        for pattern_info in action_patterns:
-            matches = re.findall(pattern_info["pattern"], scenario, re.IGNORECASE)
-            for match in matches:
+        for pattern, action_template, expected, priority in _SCENARIO_ACTION_PATTERNS:
+            for match in pattern.findall(scenario):
                 if isinstance(match, tuple):
                     match = " ".join(match)
                 
-                action = pattern_info["action_template"].format(match)
-                expected = pattern_info["expected"]
-                
-                actions.append({
-                    "action": action,
-                    "expected": expected,
-                    "priority": pattern_info["priority"]
-                })
+                actions.append(ScenarioAction(action_template.format(match), expected, priority))
         
         # 如果没有提取到足够的动作，添加通用步骤
         if len(actions) < 2:
             actions.extend(self._generate_fallback_actions(scenario))
         
-        # 按优先级排序
-        actions.sort(key=lambda x: x["priority"])
+        # 按优先级分桶（优先级只有 1-3），桶内保持原有顺序，代替排序
+        buckets = ([], [], [], [])
+        for action_info in actions:
+            buckets[action_info.priority].append(action_info)
         
         # 去重和优化
         unique_actions = []
         seen_actions = set()
         
-        for action_info in actions:
-            action_key = action_info["action"][:25]  # 使用前25个字符作为去重键
-            if action_key not in seen_actions:
-                seen_actions.add(action_key)
-                unique_actions.append(action_info)
+        for bucket in buckets:
+            for action_info in bucket:
+                action_key = action_info.action[:25]  # 使用前25个字符作为去重键
+                if action_key not in seen_actions:
+                    seen_actions.add(action_key)
+                    unique_actions.append(action_info)
         
         # 根据复杂度限制步骤数量
-        max_steps = self._get_max_steps_by_complexity(complexity)
-        return unique_actions[:max_steps]
+        return unique_actions[:self._get_step_limits(complexity).max]
     
     def _parse_scenario_structure(self, scenario: str) -> Optional[Dict]:
         """解析场景结构，提取前置条件、主要操作和验证点"""
@@ -580,35 +1453,23 @@ class TestCaseGenerator:
     
     def _split_scenario_sentences(self, scenario: str) -> List[str]:
         """将场景分割成句子"""
-        # 按常见分隔符分割
-        import re
-        sentences = re.split(r'[，。；,;]|，然后|，接着|，再|，最后|，验证', scenario)
-        
-        # 清理空句子
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
-        return sentences
+        # 按常见分隔符分割，并清理空句子
+        return [s.strip() for s in _SENTENCE_SPLIT_RE.split(scenario) if s.strip()]
     
     def _classify_sentence_type(self, sentence: str) -> str:
         """分类句子类型"""
-        # 前置条件关键词
-        precondition_keywords = ["打开", "进入", "启动", "登录", "准备", "设置"]
-        
-        # 验证关键词
-        validation_keywords = ["验证", "检查", "确认", "查看", "观察", "测试"]
-        
         # 检查是否为前置条件
-        if any(keyword in sentence[:10] for keyword in precondition_keywords):
+        if _SENTENCE_PRECONDITION_RE.search(sentence, 0, 10) is not None:
             return "precondition"
         
         # 检查是否为验证步骤
-        if any(keyword in sentence for keyword in validation_keywords):
+        if _SENTENCE_VALIDATION_RE.search(sentence) is not None:
             return "validation"
         
         # 默认为主要操作
         return "main_action"
     
-    def _extract_action_expected_from_sentence(self, sentence: str, sentence_type: str) -> Optional[Dict]:
+    def _extract_action_expected_from_sentence(self, sentence: str, sentence_type: str) -> Optional[ActionStep]:
         """从句子中提取操作和期望结果"""
         if not sentence:
             return None
@@ -623,253 +1484,151 @@ class TestCaseGenerator:
         
         return None
     
-    def _generate_precondition_step(self, sentence: str) -> Dict:
+    def _generate_precondition_step(self, sentence: str) -> ActionStep:
         """生成前置条件步骤"""
         # 提取关键信息
         if "登录" in sentence:
-            return {
-                "action": "使用有效账号登录应用",
-                "expected": "登录成功，进入主界面"
-            }
+            return ActionStep(
+                action="使用有效账号登录应用",
+                expected="登录成功，进入主界面"
+            )
         elif "打开" in sentence or "启动" in sentence:
             app_context = self._extract_app_context(sentence)
-            return {
-                "action": f"打开应用，进入{app_context}",
-                "expected": "应用启动成功，页面加载完成"
-            }
+            return ActionStep(
+                action=f"打开应用，进入{app_context}",
+                expected="应用启动成功，页面加载完成"
+            )
         elif "进入" in sentence:
             page_context = self._extract_page_context(sentence)
-            return {
-                "action": f"导航到{page_context}",
-                "expected": "页面跳转成功，内容正常显示"
-            }
+            return ActionStep(
+                action=f"导航到{page_context}",
+                expected="页面跳转成功，内容正常显示"
+            )
         else:
-            return {
-                "action": sentence,
-                "expected": "前置条件满足，环境准备就绪"
-            }
+            return ActionStep(
+                action=sentence,
+                expected="前置条件满足，环境准备就绪"
+            )
     
-    def _generate_main_action_step(self, sentence: str) -> Dict:
+    def _generate_main_action_step(self, sentence: str) -> ActionStep:
         """生成主要操作步骤"""
-        # 根据操作类型生成具体的步骤
-        if "输入" in sentence:
-            input_content = self._extract_input_content(sentence)
-            if "用户名" in sentence:
-                return {
-                    "action": f"在用户名输入框中输入有效的用户名",
-                    "expected": "用户名输入成功，字段显示正常"
-                }
-            elif "密码" in sentence:
-                return {
-                    "action": f"在密码输入框中输入正确的密码",
-                    "expected": "密码输入成功，显示为密文"
-                }
-            elif "关键词" in sentence or "搜索" in sentence:
-                return {
-                    "action": f"在搜索框中输入商品关键词",
-                    "expected": "搜索词输入成功，搜索建议显示"
-                }
-            else:
-                return {
-                    "action": f"在相应字段输入{input_content}",
-                    "expected": "输入内容正确显示，格式验证通过"
-                }
-        elif "点击" in sentence:
-            click_target = self._extract_click_target(sentence)
-            if "登录" in sentence:
-                return {
-                    "action": "点击登录按钮",
-                    "expected": "登录请求发送，显示加载状态"
-                }
-            elif "搜索" in sentence:
-                return {
-                    "action": "点击搜索按钮或按回车键",
-                    "expected": "搜索请求发送，开始加载结果"
-                }
-            elif "购物车" in sentence or "加入" in sentence:
-                return {
-                    "action": "点击加入购物车按钮",
-                    "expected": "商品添加成功，购物车图标更新"
-                }
-            elif "结算" in sentence:
-                return {
-                    "action": "点击结算按钮",
-                    "expected": "跳转到结算页面，商品信息显示"
-                }
-            elif "支付" in sentence:
-                return {
-                    "action": "点击支付按钮",
-                    "expected": "跳转到支付页面，显示支付金额和支付方式选项"
-                }
-            elif "保存" in sentence:
-                return {
-                    "action": "点击保存按钮",
-                    "expected": "数据保存成功，显示保存确认提示"
-                }
-            elif "确认" in sentence:
-                return {
-                    "action": "点击确认按钮",
-                    "expected": "操作确认执行，相关状态更新"
-                }
-            elif "取消" in sentence:
-                return {
-                    "action": "点击取消按钮",
-                    "expected": "操作取消，返回上一步状态"
-                }
-            else:
-                return {
-                    "action": f"点击{click_target}",
-                    "expected": self._generate_context_specific_expected(sentence, "点击")
-                }
-        elif "选择" in sentence:
-            if "商品" in sentence:
-                return {
-                    "action": "选择目标商品或商品规格",
-                    "expected": "商品高亮显示，规格选项展开，价格信息更新"
-                }
-            elif "地址" in sentence:
-                return {
-                    "action": "选择收货地址",
-                    "expected": "地址被标记为选中状态，配送费用和时间更新"
-                }
-            elif "支付方式" in sentence:
-                return {
-                    "action": "选择支付方式",
-                    "expected": "支付方式图标高亮，相关支付信息显示"
-                }
-            elif "类别" in sentence or "分类" in sentence:
-                return {
-                    "action": "选择商品类别",
-                    "expected": "类别被选中，相关商品筛选显示"
-                }
-            else:
-                select_target = self._extract_select_target(sentence)
-                return {
-                    "action": f"选择{select_target}",
-                    "expected": self._generate_context_specific_expected(sentence, "选择")
-                }
-        elif "浏览" in sentence:
-            return {
-                "action": "浏览页面内容和商品信息",
-                "expected": "页面内容正常显示，图片加载完成"
-            }
-        elif "修改" in sentence or "编辑" in sentence:
-            if "信息" in sentence:
-                return {
-                    "action": "修改个人信息字段",
-                    "expected": "信息修改成功，字段内容更新"
-                }
-            else:
-                return {
-                    "action": "执行修改操作",
-                    "expected": "修改内容保存，界面更新"
-                }
-        elif "保存" in sentence:
-            return {
-                "action": "点击保存按钮确认修改",
-                "expected": "保存操作执行，显示保存状态"
-            }
-        elif "滑动" in sentence or "拖拽" in sentence:
-            return {
-                "action": "执行滑动或拖拽操作",
-                "expected": "界面响应流畅，内容正常更新"
-            }
-        else:
+        # 根据操作类型和操作对象生成具体的步骤（各一次关键词扫描）
+        action_type = _match_keyword_rules(_MAIN_ACTION_TYPE_RULES, sentence)
+        if action_type is None:
             # 通用操作，尽量保持原句的具体性
-            return {
-                "action": sentence,
-                "expected": "操作执行成功，功能正常响应"
-            }
+            return ActionStep(
+                action=sentence,
+                expected="操作执行成功，功能正常响应"
+            )
+        
+        step_rules = _MAIN_ACTION_STEP_RULES.get(action_type)
+        step = _match_keyword_rules(step_rules, sentence) if step_rules else None
+        if step is None:
+            step = _MAIN_ACTION_DEFAULT_STEPS.get(action_type)
+        if step is not None:
+            return ActionStep(*step)
+        
+        # 没有匹配到具体操作对象时，从句子中提取
+        if action_type == "输入":
+            return ActionStep(
+                action=_INPUT_ACTIONS[self._extract_input_content(sentence)],
+                expected="输入内容正确显示，格式验证通过"
+            )
+        if action_type == "点击":
+            target = self._extract_click_target(sentence)
+        else:
+            target = self._extract_select_target(sentence)
+        return ActionStep(
+            action=f"{action_type}{target}",
+            expected=self._generate_context_specific_expected(sentence, action_type)
+        )
     
-    def _generate_validation_step(self, sentence: str) -> Dict:
+    def _generate_validation_step(self, sentence: str) -> ActionStep:
         """生成验证步骤"""
         # 更具体的验证步骤生成
         if "跳转" in sentence:
             if "主页" in sentence or "首页" in sentence:
-                return {
-                    "action": "检查页面跳转结果",
-                    "expected": "成功跳转到主页，显示用户个人信息和主要功能入口"
-                }
+                return ActionStep(
+                    action="检查页面跳转结果",
+                    expected="成功跳转到主页，显示用户个人信息和主要功能入口"
+                )
             elif "详情" in sentence:
-                return {
-                    "action": "检查页面跳转结果", 
-                    "expected": "成功跳转到详情页，商品图片、价格、描述信息完整显示"
-                }
+                return ActionStep(
+                    action="检查页面跳转结果",
+                    expected="成功跳转到详情页，商品图片、价格、描述信息完整显示"
+                )
             elif "结果" in sentence:
-                return {
-                    "action": "检查搜索结果页面",
-                    "expected": "显示相关商品列表，包含商品图片、名称、价格等关键信息"
-                }
+                return ActionStep(
+                    action="检查搜索结果页面",
+                    expected="显示相关商品列表，包含商品图片、名称、价格等关键信息"
+                )
             elif "订单" in sentence:
-                return {
-                    "action": "检查订单页面跳转",
-                    "expected": "跳转到订单详情页，显示订单号、商品信息、支付状态"
-                }
+                return ActionStep(
+                    action="检查订单页面跳转",
+                    expected="跳转到订单详情页，显示订单号、商品信息、支付状态"
+                )
             else:
-                target_page = self._extract_target_page(sentence)
-                return {
-                    "action": "检查页面跳转结果",
-                    "expected": f"成功跳转到{target_page}，页面内容加载完整"
-                }
+                return ActionStep(
+                    action="检查页面跳转结果",
+                    expected=_TARGET_PAGE_EXPECTATIONS[self._extract_target_page(sentence)]
+                )
         elif "显示" in sentence:
             if "商品" in sentence:
-                return {
-                    "action": "检查商品显示效果",
-                    "expected": "商品列表正确显示，图片清晰，价格、评分等信息准确"
-                }
+                return ActionStep(
+                    action="检查商品显示效果",
+                    expected="商品列表正确显示，图片清晰，价格、评分等信息准确"
+                )
             elif "错误" in sentence or "提示" in sentence:
-                return {
-                    "action": "检查错误提示信息",
-                    "expected": "显示明确的错误提示，提示内容友好易懂"
-                }
+                return ActionStep(
+                    action="检查错误提示信息",
+                    expected="显示明确的错误提示，提示内容友好易懂"
+                )
             elif "成功" in sentence:
-                return {
-                    "action": "检查成功提示信息",
-                    "expected": "显示操作成功提示，界面状态正确更新"
-                }
+                return ActionStep(
+                    action="检查成功提示信息",
+                    expected="显示操作成功提示，界面状态正确更新"
+                )
             else:
-                display_content = self._extract_display_content(sentence)
-                return {
-                    "action": "检查界面显示内容",
-                    "expected": f"正确显示{display_content}，布局整齐美观"
-                }
+                return ActionStep(
+                    action="检查界面显示内容",
+                    expected=_DISPLAY_EXPECTATIONS[self._extract_display_content(sentence)]
+                )
         elif "添加" in sentence and "购物车" in sentence:
-            return {
-                "action": "验证商品添加到购物车",
-                "expected": "购物车图标显示商品数量，商品信息正确保存"
-            }
+            return ActionStep(
+                action="验证商品添加到购物车",
+                expected="购物车图标显示商品数量，商品信息正确保存"
+            )
         elif "数量" in sentence:
-            return {
-                "action": "验证数量变化",
-                "expected": "数量显示正确更新，相关价格计算准确"
-            }
+            return ActionStep(
+                action="验证数量变化",
+                expected="数量显示正确更新，相关价格计算准确"
+            )
         elif "信息" in sentence and "更新" in sentence:
-            return {
-                "action": "验证信息更新结果",
-                "expected": "个人信息成功更新，页面显示最新内容"
-            }
+            return ActionStep(
+                action="验证信息更新结果",
+                expected="个人信息成功更新，页面显示最新内容"
+            )
         elif "支付" in sentence and "成功" in sentence:
-            return {
-                "action": "验证支付完成状态",
-                "expected": "支付成功，生成订单号，发送确认短信或邮件"
-            }
+            return ActionStep(
+                action="验证支付完成状态",
+                expected="支付成功，生成订单号，发送确认短信或邮件"
+            )
         elif "登录" in sentence and "成功" in sentence:
-            return {
-                "action": "验证登录状态",
-                "expected": "用户头像和昵称显示，个人中心功能可正常访问"
-            }
+            return ActionStep(
+                action="验证登录状态",
+                expected="用户头像和昵称显示，个人中心功能可正常访问"
+            )
         else:
             # 从句子中提取具体的验证内容
             verification_content = self._extract_specific_verification(sentence)
-            return {
-                "action": f"验证{verification_content['action']}",
-                "expected": verification_content['expected']
-            }
+            return ActionStep(
+                action=f"验证{verification_content.action}",
+                expected=verification_content.expected
+            )
     
     def _extract_app_context(self, sentence: str) -> str:
         """提取应用上下文"""
-        contexts = ["主页", "首页", "登录页", "商品页", "购物车", "个人中心", "设置页"]
-        for context in contexts:
+        for context in _APP_CONTEXTS:
             if context in sentence:
                 return context
         return "相关页面"
@@ -950,48 +1709,24 @@ class TestCaseGenerator:
         else:
             return "相关内容"
     
-    def _extract_specific_verification(self, sentence: str) -> Dict:
+    def _extract_specific_verification(self, sentence: str) -> ActionStep:
         """提取具体的验证内容"""
-        # 根据句子内容生成具体的验证动作和期望
-        if "功能" in sentence:
-            return {
-                "action": "功能可用性",
-                "expected": "功能正常运行，响应及时，无异常错误"
-            }
-        elif "界面" in sentence:
-            return {
-                "action": "界面显示效果",
-                "expected": "界面布局合理，元素对齐，色彩搭配协调"
-            }
-        elif "数据" in sentence:
-            return {
-                "action": "数据准确性",
-                "expected": "数据内容准确，格式正确，实时同步"
-            }
-        elif "状态" in sentence:
-            return {
-                "action": "系统状态",
-                "expected": "状态显示正确，状态变化及时反馈"
-            }
-        elif "流程" in sentence:
-            return {
-                "action": "业务流程",
-                "expected": "流程执行顺畅，各环节衔接正常"
-            }
-        else:
-            # 提取句子中的关键词作为验证点
-            key_words = self._extract_key_words(sentence)
-            return {
-                "action": f"{key_words}的正确性",
-                "expected": f"{key_words}符合预期要求，无异常情况"
-            }
+        # 根据句子内容选取具体的验证动作和期望
+        for keyword, verification in _SPECIFIC_VERIFICATIONS:
+            if keyword in sentence:
+                return verification
+        
+        # 提取句子中的关键词作为验证点
+        key_words = self._extract_key_words(sentence)
+        return ActionStep(
+            action=f"{key_words}的正确性",
+            expected=f"{key_words}符合预期要求，无异常情况"
+        )
     
     def _extract_key_words(self, sentence: str) -> str:
         """从句子中提取关键词"""
         # 移除常见的动词和助词
-        import re
-        cleaned = re.sub(r'(验证|检查|确认|测试|是否|能够|正确|成功)', '', sentence)
-        cleaned = cleaned.strip()
+        cleaned = _KEY_WORD_NOISE_RE.sub('', sentence).strip()
         
         # 如果清理后为空，返回默认值
         if not cleaned:
@@ -1038,20 +1773,18 @@ class TestCaseGenerator:
                 return "商品被加入选择列表，可进行对比或批量操作"
         else:
             # 通用的上下文相关期望
-            context_expectations = {
-                "点击": "界面响应迅速，相关功能模块激活，用户反馈明确",
-                "选择": "选项状态更新，相关信息联动显示，操作反馈及时",
-                "输入": "输入内容实时验证，格式提示友好，错误处理得当",
-                "滑动": "页面滑动流畅，内容加载及时，交互体验良好"
-            }
-            return context_expectations.get(action_type, "操作执行成功，系统响应正常")
-    
-    def _generate_final_expected_result(self, test_point: TestPoint, scenario_info: Dict) -> str:
+            return _GENERIC_CONTEXT_EXPECTATIONS.get(action_type, "操作执行成功，系统响应正常")
+    
+    def _generate_final_expected_result(self, test_point: TestPoint, scenario_info: ScenarioInfo) -> str:
         """生成最终的期望结果"""
-        scenario = scenario_info["description"]
-        
+        return self._final_expected_result(test_point.description, test_point.category, scenario_info.description)
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _final_expected_result(description: str, category: TestCategory, scenario: str) -> str:
+        """按测试要点描述、类别和场景选取最终期望结果（重复组合直接命中缓存）"""
         # 根据测试要点和场景生成具体的最终期望结果
-        if "登录" in test_point.description:
+        if "登录" in description:
             if "成功" in scenario:
                 return "用户成功登录系统，个人信息正确显示，可正常访问各功能模块"
             elif "错误" in scenario:
@@ -1059,22 +1792,22 @@ class TestCaseGenerator:
             else:
                 return "登录流程完整执行，用户身份验证准确，系统安全性得到保障"
         
-        elif "搜索" in test_point.description:
+        elif "搜索" in description:
             return "搜索功能正常运行，结果准确相关，用户能够快速找到目标商品"
         
-        elif "购物车" in test_point.description:
+        elif "购物车" in description:
             return "购物车功能完整可用，商品信息准确保存，数量和价格计算正确"
         
-        elif "支付" in test_point.description:
+        elif "支付" in description:
             return "支付流程安全可靠，订单生成成功，用户收到确认通知"
         
-        elif "个人" in test_point.description or "信息" in test_point.description:
+        elif "个人" in description or "信息" in description:
             return "个人信息管理功能正常，数据更新及时，隐私保护到位"
         
-        elif test_point.category == TestCategory.COMPATIBILITY:
+        elif category == TestCategory.COMPATIBILITY:
             return "功能在不同设备和环境下表现一致，兼容性良好，用户体验统一"
         
-        elif test_point.category == TestCategory.USABILITY:
+        elif category == TestCategory.USABILITY:
             return "界面操作直观易懂，用户体验流畅，功能易于发现和使用"
         
         else:
@@ -1088,128 +1821,109 @@ class TestCaseGenerator:
             else:
                 return "功能执行完整准确，用户操作得到及时反馈，整体体验良好"
     
-    def _get_min_steps_by_complexity(self, complexity: str) -> int:
-        """根据复杂度获取最少步骤数"""
-        min_steps = {
-            "简单": 2,
-            "中等": 2,
-            "复杂": 3,
-            "复合": 4
-        }
-        return min_steps.get(complexity, 2)
-    
-    def _get_max_steps_by_complexity(self, complexity: str) -> int:
-        """根据复杂度获取最多步骤数"""
-        max_steps = {
-            "简单": 3,
-            "中等": 5,
-            "复杂": 7,
-            "复合": 10
-        }
-        return max_steps.get(complexity, 5)
+    def _get_step_limits(self, complexity: str) -> StepLimits:
+        """根据复杂度获取最少、最多步骤数"""
+        return _STEP_LIMITS_BY_COMPLEXITY.get(complexity, _DEFAULT_STEP_LIMITS)
     
-    def _generate_fallback_actions(self, scenario: str) -> List[Dict]:
+    def _generate_fallback_actions(self, scenario: str) -> List[ScenarioAction]:
         """生成回退动作（当无法从场景中提取足够动作时）"""
         fallback_actions = []
         
         # 基础前置步骤
         if "登录" in scenario or "用户" in scenario:
-            fallback_actions.append({
-                "action": "打开应用，进入相关功能页面",
-                "expected": "页面加载完成，界面显示正常",
-                "priority": 1
-            })
+            fallback_actions.append(ScenarioAction("打开应用，进入相关功能页面", "页面加载完成，界面显示正常", 1))
         
         # 核心操作步骤
-        fallback_actions.append({
-            "action": "执行场景中描述的核心操作",
-            "expected": "操作执行成功，系统响应正常",
-            "priority": 2
-        })
+        fallback_actions.append(ScenarioAction("执行场景中描述的核心操作", "操作执行成功，系统响应正常", 2))
         
         # 结果验证步骤
         if "验证" in scenario or "检查" in scenario or "确认" in scenario:
-            fallback_actions.append({
-                "action": "验证操作结果和系统状态",
-                "expected": "结果符合预期，功能正常",
-                "priority": 3
-            })
+            fallback_actions.append(ScenarioAction("验证操作结果和系统状态", "结果符合预期，功能正常", 3))
         
         return fallback_actions
     
-    def _generate_basic_template_steps(self, test_point: TestPoint, scenario_info: Dict) -> List[TestStep]:
+    def _generate_basic_template_steps(self, test_point: TestPoint, scenario_info: ScenarioInfo) -> List[FastTestStep]:
         """生成基础模板步骤"""
-        steps = []
-        scenario = scenario_info["description"]
-        action_type = scenario_info["action_type"]
-        
         # 分析场景复杂度
-        complexity = self._analyze_scenario_complexity(scenario)
+        complexity = self._analyze_scenario_complexity(scenario_info.description)
         
         # 根据复杂度和场景内容动态生成步骤
         step_templates = self._build_step_templates(test_point, scenario_info, complexity)
         
-        # 生成步骤
-        for i, template in enumerate(step_templates, 1):
-            step = TestStep(
-                step_no=i,
-                action=template["action"],
-                expected=template["expected"]
-            )
-            steps.append(step)
-        
-        return steps
+        return self._build_steps(step_templates)
     
-    def _build_step_templates(self, test_point: TestPoint, scenario_info: Dict, complexity: str) -> List[Dict]:
+    @staticmethod
+    def _build_steps(templates: Iterable[ActionStep]) -> List[FastTestStep]:
+        """按操作、期望结果依次创建编号的测试步骤"""
+        return [
+            FastTestStep(step_no=i, action=action, expected=expected)
+            for i, (action, expected) in enumerate(templates, 1)
+        ]
+    
+    def _build_step_templates(self, test_point: TestPoint, scenario_info: ScenarioInfo, complexity: str) -> List[ActionStep]:
         """构建步骤模板"""
         templates = []
-        scenario = scenario_info["description"]
-        action_type = scenario_info["action_type"]
+        scenario = scenario_info.description
+        action_type = scenario_info.action_type
         
         # 1. 前置条件（根据需要添加）
         if self._needs_precondition_step(test_point, scenario):
-            templates.append({
-                "action": f"打开应用，进入{self._get_feature_context(test_point.description)}",
-                "expected": "页面加载完成，界面显示正常"
-            })
+            templates.append(ActionStep(
+                # 取值范围很小，驻留后各用例共享同一字符串对象
+                action=sys.intern(f"打开应用，进入{self._get_feature_context(test_point.description)}"),
+                expected="页面加载完成，界面显示正常"
+            ))
         
         # 2. 准备步骤（复杂场景需要）
-        if complexity in ["复杂", "复合"] and self._needs_preparation_step(scenario):
+        if complexity in ("复杂", "复合") and self._needs_preparation_step(scenario):
             prep_action = self._generate_preparation_action(scenario)
             if prep_action:
-                templates.append({
-                    "action": prep_action,
-                    "expected": "准备工作完成，环境设置正确"
-                })
+                templates.append(ActionStep(
+                    action=prep_action,
+                    expected="准备工作完成，环境设置正确"
+                ))
         
         # 3. 核心操作步骤
         core_actions = self._generate_core_action_steps(scenario, action_type, complexity)
         templates.extend(core_actions)
         
         # 4. 中间验证（复杂场景需要）
-        if complexity in ["复合"] and len(templates) > 3:
-            templates.append({
-                "action": "检查中间状态和反馈信息",
-                "expected": "中间状态正确，反馈信息明确"
-            })
+        if complexity == "复合" and len(templates) > 3:
+            templates.append(ActionStep(
+                action="检查中间状态和反馈信息",
+                expected="中间状态正确，反馈信息明确"
+            ))
         
         # 5. 结果验证
-        templates.append({
-            "action": f"验证{self._extract_verification_point(scenario)}",
-            "expected": scenario_info["expected_result"]
-        })
+        templates.append(ActionStep(
+            action=f"验证{self._extract_verification_point(scenario)}",
+            expected=scenario_info.expected_result
+        ))
         
         return templates
     
     def _needs_precondition_step(self, test_point: TestPoint, scenario: str) -> bool:
         """判断是否需要前置条件步骤"""
-        precondition_keywords = ["登录", "权限", "设置", "配置", "打开", "进入"]
-        return any(keyword in scenario for keyword in precondition_keywords)
+        return self._analyze_step_needs(scenario)[0]
     
     def _needs_preparation_step(self, scenario: str) -> bool:
         """判断是否需要准备步骤"""
-        preparation_keywords = ["准备", "设置", "配置", "选择", "添加"]
-        return any(keyword in scenario for keyword in preparation_keywords)
+        return self._analyze_step_needs(scenario)[1]
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _analyze_step_needs(scenario: str) -> Tuple[bool, bool]:
+        """一次扫描判断场景是否需要前置条件步骤、准备步骤"""
+        needs_precondition = needs_preparation = False
+        for match in _STEP_NEEDS_RE.finditer(scenario):
+            group = match.lastgroup
+            if group != "preparation":
+                needs_precondition = True
+            if group != "precondition":
+                needs_preparation = True
+            if needs_precondition and needs_preparation:
+                break
+        return needs_precondition, needs_preparation
     
     def _generate_preparation_action(self, scenario: str) -> Optional[str]:
         """生成准备步骤的操作"""
@@ -1223,115 +1937,104 @@ class TestCaseGenerator:
             return "设置网络环境（如弱网、断网等）"
         return None
     
-    def _generate_core_action_steps(self, scenario: str, action_type: str, complexity: str) -> List[Dict]:
-        """生成核心操作步骤"""
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _generate_core_action_steps(scenario: str, action_type: str, complexity: str) -> Tuple[ActionStep, ...]:
+        """生成核心操作步骤（只依赖场景文本，重复出现的场景直接命中缓存）"""
         core_steps = []
         
         # 根据复杂度决定核心步骤数量
         if complexity == "简单":
             # 简单场景：1个核心步骤
-            core_steps.append({
-                "action": self._generate_smart_core_action(scenario, action_type),
-                "expected": self._generate_smart_action_expected(scenario, action_type)
-            })
+            core_steps.append(ActionStep(
+                action=TestCaseGenerator._generate_smart_core_action(scenario, action_type),
+                expected=TestCaseGenerator._generate_smart_action_expected(scenario, action_type)
+            ))
         elif complexity == "中等":
             # 中等场景：1-2个核心步骤
-            core_steps.append({
-                "action": self._generate_smart_core_action(scenario, action_type),
-                "expected": self._generate_smart_action_expected(scenario, action_type)
-            })
+            core_steps.append(ActionStep(
+                action=TestCaseGenerator._generate_smart_core_action(scenario, action_type),
+                expected=TestCaseGenerator._generate_smart_action_expected(scenario, action_type)
+            ))
             
             # 如果场景包含多个动作，添加第二个步骤
-            if len(re.findall(r'(然后|接着|再|继续)', scenario)) > 0:
-                core_steps.append({
-                    "action": "继续执行后续操作",
-                    "expected": "后续操作执行成功"
-                })
+            if _SEQUENCE_WORD_RE.search(scenario):
+                core_steps.append(ActionStep(
+                    action="继续执行后续操作",
+                    expected="后续操作执行成功"
+                ))
         else:
             # 复杂/复合场景：2-3个核心步骤
-            actions = re.findall(r'(输入|点击|选择|滑动|切换|查看).*?[，。]', scenario)
+            # 只取前3个操作，匹配到第3个即停止扫描（取值与 findall 的分组结果一致）
+            actions = [match.group(1) for match in islice(_SCENARIO_OPERATION_RE.finditer(scenario), 3)]
             
             if len(actions) >= 2:
-                for i, action in enumerate(actions[:3]):
-                    core_steps.append({
-                        "action": action.rstrip('，。'),
-                        "expected": f"第{i+1}步操作执行成功"
-                    })
+                for i, action in enumerate(actions):
+                    core_steps.append(ActionStep(
+                        action=action.rstrip('，。'),
+                        expected=f"第{i+1}步操作执行成功"
+                    ))
             else:
                 # 回退到基础步骤
-                core_steps.append({
-                    "action": self._generate_smart_core_action(scenario, action_type),
-                    "expected": self._generate_smart_action_expected(scenario, action_type)
-                })
-                core_steps.append({
-                    "action": "完成相关后续操作",
-                    "expected": "所有操作执行完成"
-                })
-        
-        return core_steps
-    
-    def _generate_smart_core_action(self, scenario: str, action_type: str) -> str:
+                core_steps.append(ActionStep(
+                    action=TestCaseGenerator._generate_smart_core_action(scenario, action_type),
+                    expected=TestCaseGenerator._generate_smart_action_expected(scenario, action_type)
+                ))
+                core_steps.append(ActionStep(
+                    action="完成相关后续操作",
+                    expected="所有操作执行完成"
+                ))
+        
+        return tuple(core_steps)
+    
+    @staticmethod
+    def _generate_smart_core_action(scenario: str, action_type: str) -> str:
         """生成智能的核心操作步骤"""
-        # 从场景中提取关键操作词
-        key_actions = re.findall(r'(输入|点击|选择|滑动|切换|查看|验证).*?[，。]', scenario)
+        # 从场景中提取关键操作词（只需第一个）
+        key_action = _SMART_ACTION_RE.search(scenario)
         
-        if key_actions:
+        if key_action:
             # 使用提取的操作
-            return key_actions[0].rstrip('，。')
+            return key_action.group(1).rstrip('，。')
         
         # 回退到基础模板
-        action_templates = {
-            "点击": "点击相关按钮执行操作",
-            "输入": "在输入框中输入相关信息",
-            "滑动": "通过滑动手势进行操作",
-            "查看": "查看页面显示的内容",
-            "切换": "切换到目标状态或页面",
-            "操作": "执行相关功能操作"
-        }
-        
-        return action_templates.get(action_type, "执行相关功能操作")
+        return _SMART_ACTION_TEMPLATES.get(action_type, "执行相关功能操作")
     
-    def _generate_smart_action_expected(self, scenario: str, action_type: str) -> str:
+    @staticmethod
+    def _generate_smart_action_expected(scenario: str, action_type: str) -> str:
         """生成智能的操作期望结果"""
-        # 从场景中提取期望关键词
-        expected_keywords = re.findall(r'(成功|正确|显示|跳转|提示|验证)', scenario)
+        # 从场景中提取期望关键词（只需第一个）
+        expected_keyword = _EXPECTED_KEYWORD_RE.search(scenario)
         
-        if expected_keywords:
-            return f"操作{expected_keywords[0]}，功能正常执行"
+        if expected_keyword:
+            return sys.intern(f"操作{expected_keyword.group()}，功能正常执行")
         
         # 回退到基础模板
-        expected_templates = {
-            "点击": "按钮响应及时，操作执行成功",
-            "输入": "信息输入成功，格式验证通过",
-            "滑动": "页面滑动流畅，内容正常显示",
-            "查看": "信息显示完整，布局正确",
-            "切换": "状态切换成功，界面更新正确",
-            "操作": "功能执行成功，结果正确"
-        }
-        
-        return expected_templates.get(action_type, "操作执行成功")
-    
-    def _extract_verification_point(self, scenario: str) -> str:
-        """从场景中提取验证要点"""
-        verification_patterns = [
-            r'验证(.*?)(?:[，。]|$)',
-            r'检查(.*?)(?:[，。]|$)',
-            r'确认(.*?)(?:[，。]|$)'
-        ]
-        
-        for pattern in verification_patterns:
-            matches = re.findall(pattern, scenario)
-            if matches:
-                return matches[0].strip()
-        
-        return "功能执行结果"
-    
-    def _generate_category_specific_cases(self, test_point: TestPoint) -> List[TestCase]:
+        return _SMART_EXPECTED_TEMPLATES.get(action_type, "操作执行成功")
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _extract_verification_point(scenario: str) -> str:
+        """从场景中提取验证要点（重复出现的场景直接命中缓存）"""
+        # 取优先级最高的动词首次出现处的内容，与按动词依次查找的结果一致
+        best_rank = len(_VERIFICATION_VERB_RANKS)
+        point = None
+        for match in _VERIFICATION_POINT_RE.finditer(scenario):
+            rank = _VERIFICATION_VERB_RANKS[match.group(1)]
+            if rank < best_rank:
+                best_rank = rank
+                point = match.group(2)
+                if rank == 0:
+                    break
+        
+        return point.strip() if point is not None else "功能执行结果"
+    
+    def _generate_category_specific_cases(self, test_point: TestPoint) -> List[FastTestCase]:
         """根据测试类别生成特定用例"""
         cases = []
         
         # 只为高优先级的测试要点生成额外用例
-        if test_point.priority not in [Priority.P0, Priority.P1]:
+        if test_point.priority not in _HIGH_PRIORITIES:
             return cases
         
         # 根据类别生成1个关键用例
@@ -1346,7 +2049,7 @@ class TestCaseGenerator:
         
         return cases
     
-    def _create_compatibility_case(self, test_point: TestPoint) -> Optional[TestCase]:
+    def _create_compatibility_case(self, test_point: TestPoint) -> Optional[FastTestCase]:
         """创建兼容性测试用例"""
         case = self._create_base_case(test_point, "兼容性")
         case.title = f"{test_point.description} - 设备兼容性"
@@ -1358,6 +2061,7 @@ class TestCaseGenerator:
             if ai_steps:
                 case.steps = ai_steps
             else:
+                self._ai_fallback_used = True
                 case.steps = self._get_default_compatibility_steps()
         else:
             case.steps = self._get_default_compatibility_steps()
@@ -1365,44 +2069,19 @@ class TestCaseGenerator:
         case.expected_result = "功能在各种设备上兼容性良好，用户体验一致"
         return case
     
-    def _generate_ai_compatibility_steps(self, test_point: TestPoint) -> Optional[List[TestStep]]:
+    def _generate_ai_compatibility_steps(self, test_point: TestPoint) -> Optional[List[FastTestStep]]:
         """使用AI生成兼容性测试步骤"""
         try:
             # 分析功能复杂度来确定步骤数量
             complexity = self._analyze_scenario_complexity(test_point.description)
-            step_range = self._get_step_range_by_complexity(complexity)
-            
-            prompt = f"""作为移动端测试专家，请为以下功能生成兼容性测试步骤。
-
-功能描述: {test_point.description}
-测试类别: {test_point.category.value}
-功能复杂度: {complexity}
-
-要求:
-1. 根据功能复杂度生成{step_range}个兼容性测试步骤
-2. 重点关注移动端设备差异（屏幕尺寸、系统版本、横竖屏等）
-3. 每个步骤要具体可执行
-4. 期望结果要明确可验证
-5. 步骤数量要合理，避免为了凑数而添加无意义步骤
-
-兼容性测试重点:
-- 不同屏幕尺寸适配
-- 横竖屏切换
-- 不同系统版本
-- 不同设备性能
-- 网络环境差异
-
-请按以下JSON格式返回:
-{{
-  "steps": [
-    {{
-      "action": "具体的兼容性测试操作",
-      "expected": "具体的兼容性验证结果"
-    }}
-  ]
-}}"""
+            prompt = "".join([
+                _COMPATIBILITY_PROMPT_HEAD,
+                f"功能描述: {test_point.description}\n",
+                self._render_category_prompt_tail(_COMPATIBILITY_PROMPT_TAIL, test_point.category.value, complexity),
+            ])
 
-            response = self.ai_provider.chat(prompt)
+            cache_key = ("compatibility", test_point.category.value, test_point.description, complexity)
+            response = self._cached_ai_chat(cache_key, prompt, is_complete=self._has_complete_json)
             steps_data = self._parse_ai_steps_response(response)
             
             if steps_data:
@@ -1413,27 +2092,21 @@ class TestCaseGenerator:
         
         return None
     
-    def _get_default_compatibility_steps(self) -> List[TestStep]:
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _render_category_prompt_tail(template: str, category: str, complexity: str) -> str:
+        """渲染兼容性/易用性提示词中只依赖类别和复杂度的部分"""
+        return template.format(
+            category=category,
+            complexity=complexity,
+            step_range=TestCaseGenerator._get_step_range_by_complexity(complexity)
+        )
+    
+    def _get_default_compatibility_steps(self) -> List[FastTestStep]:
         """获取默认的兼容性测试步骤"""
-        return [
-            TestStep(
-                step_no=1,
-                action="在不同屏幕尺寸的设备上打开功能页面",
-                expected="页面布局自适应，元素显示完整"
-            ),
-            TestStep(
-                step_no=2,
-                action="执行核心功能操作",
-                expected="功能正常执行，无兼容性问题"
-            ),
-            TestStep(
-                step_no=3,
-                action="切换横竖屏模式测试",
-                expected="界面适配正确，功能保持正常"
-            )
-        ]
+        return self._build_steps(_DEFAULT_COMPATIBILITY_STEPS)
     
-    def _create_usability_case(self, test_point: TestPoint) -> Optional[TestCase]:
+    def _create_usability_case(self, test_point: TestPoint) -> Optional[FastTestCase]:
         """创建易用性测试用例"""
         case = self._create_base_case(test_point, "易用性")
         case.title = f"{test_point.description} - 用户体验"
@@ -1445,6 +2118,7 @@ class TestCaseGenerator:
             if ai_steps:
                 case.steps = ai_steps
             else:
+                self._ai_fallback_used = True
                 case.steps = self._get_default_usability_steps()
         else:
             case.steps = self._get_default_usability_steps()
@@ -1452,44 +2126,19 @@ class TestCaseGenerator:
         case.expected_result = "功能易于理解和使用，用户体验良好"
         return case
     
-    def _generate_ai_usability_steps(self, test_point: TestPoint) -> Optional[List[TestStep]]:
+    def _generate_ai_usability_steps(self, test_point: TestPoint) -> Optional[List[FastTestStep]]:
         """使用AI生成易用性测试步骤"""
         try:
             # 分析功能复杂度来确定步骤数量
             complexity = self._analyze_scenario_complexity(test_point.description)
-            step_range = self._get_step_range_by_complexity(complexity)
-            
-            prompt = f"""作为移动端用户体验专家，请为以下功能生成易用性测试步骤。
-
-功能描述: {test_point.description}
-测试类别: {test_point.category.value}
-功能复杂度: {complexity}
-
-要求:
-1. 根据功能复杂度生成{step_range}个易用性测试步骤
-2. 重点关注用户体验（操作便捷性、界面友好性、错误处理等）
-3. 从新用户角度考虑操作流程
-4. 每个步骤要具体可执行
-5. 步骤数量要合理，关注质量而非数量
-
-易用性测试重点:
-- 首次使用体验
-- 操作流程直观性
-- 错误提示友好性
-- 界面元素可用性
-- 交互反馈及时性
-
-请按以下JSON格式返回:
-{{
-  "steps": [
-    {{
-      "action": "具体的易用性测试操作",
-      "expected": "具体的用户体验验证结果"
-    }}
-  ]
-}}"""
+            prompt = "".join([
+                _USABILITY_PROMPT_HEAD,
+                f"功能描述: {test_point.description}\n",
+                self._render_category_prompt_tail(_USABILITY_PROMPT_TAIL, test_point.category.value, complexity),
+            ])
 
-            response = self.ai_provider.chat(prompt)
+            cache_key = ("usability", test_point.category.value, test_point.description, complexity)
+            response = self._cached_ai_chat(cache_key, prompt, is_complete=self._has_complete_json)
             steps_data = self._parse_ai_steps_response(response)
             
             if steps_data:
@@ -1500,90 +2149,48 @@ class TestCaseGenerator:
         
         return None
     
-    def _get_default_usability_steps(self) -> List[TestStep]:
+    def _get_default_usability_steps(self) -> List[FastTestStep]:
         """获取默认的易用性测试步骤"""
-        return [
-            TestStep(
-                step_no=1,
-                action="首次使用该功能，观察操作引导",
-                expected="操作流程清晰，引导信息明确"
-            ),
-            TestStep(
-                step_no=2,
-                action="执行常见操作，注意交互反馈",
-                expected="操作响应及时，反馈信息友好"
-            ),
-            TestStep(
-                step_no=3,
-                action="测试错误操作的处理",
-                expected="错误提示清晰，恢复操作简单"
-            )
-        ]
+        return self._build_steps(_DEFAULT_USABILITY_STEPS)
     
     def _needs_precondition(self, test_point: TestPoint) -> bool:
         """判断是否需要前置条件步骤"""
         # 简化逻辑：只有涉及登录、权限等才需要前置条件
-        precondition_keywords = ["登录", "权限", "设置", "配置"]
-        return any(keyword in test_point.description for keyword in precondition_keywords)
-    
-    def _get_feature_context(self, description: str) -> str:
-        """从描述中提取功能上下文"""
-        # 提取关键功能词
-        if "购物车" in description:
-            return "购物车页面"
-        elif "登录" in description:
-            return "登录页面"
-        elif "搜索" in description:
-            return "搜索页面"
-        elif "支付" in description:
-            return "支付页面"
-        else:
+        return _PRECONDITION_RE.search(test_point.description) is not None
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _get_feature_context(description: str) -> str:
+        """从描述中提取功能上下文（同一测试要点的多个场景直接命中缓存）"""
+        # 一次扫描提取所有关键功能词，取优先级最高者
+        matches = _FEATURE_CONTEXT_RE.findall(description)
+        if not matches:
             return "相关功能页面"
+        return _FEATURE_CONTEXT_PAGES[min(matches, key=_FEATURE_CONTEXT_RANKS.__getitem__)]
     
     def _generate_core_action(self, scenario: str, action_type: str) -> str:
         """生成核心操作步骤"""
-        action_templates = {
-            "点击": f"点击相关按钮或元素，{scenario}",
-            "输入": f"在输入框中{scenario}",
-            "滑动": f"通过滑动手势{scenario}",
-            "查看": f"查看页面内容，{scenario}",
-            "切换": f"切换到目标状态，{scenario}",
-            "操作": scenario
-        }
-        
-        return action_templates.get(action_type, scenario)
+        template = _CORE_ACTION_TEMPLATES.get(action_type)
+        return template.format(scenario=scenario) if template else scenario
     
-    def _generate_action_expected(self, action_type: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _generate_action_expected(action_type: str) -> str:
         """生成操作的期望结果"""
-        expected_templates = {
-            "点击": "按钮响应，相关操作执行",
-            "输入": "内容输入成功，格式验证通过",
-            "滑动": "页面滑动流畅，内容正常显示",
-            "查看": "信息显示完整，布局正确",
-            "切换": "状态切换成功，界面更新正确",
-            "操作": "操作执行成功"
-        }
-        
-        return expected_templates.get(action_type, "操作执行成功")
+        return _ACTION_EXPECTED_TEMPLATES.get(action_type, "操作执行成功")
     
     def _needs_verification(self, test_point: TestPoint, action_type: str) -> bool:
         """判断是否需要额外的验证步骤"""
         # 对于重要功能或复杂操作，需要验证步骤
-        return (test_point.priority in [Priority.P0, Priority.P1] or 
-                action_type in ["输入", "切换"] or
+        return (test_point.priority in _HIGH_PRIORITIES or 
+                action_type in ("输入", "切换") or
                 len(test_point.scenarios) > 2)
     
-    def _create_base_case(self, test_point: TestPoint, case_type: str) -> TestCase:
+    def _create_base_case(self, test_point: TestPoint, case_type: str) -> FastTestCase:
         """创建基础测试用例结构"""
-        self.case_counter += 1
-        
-        # 生成用例ID
-        category_abbr = self._get_category_abbreviation(test_point.category)
-        test_case_id = f"TC_{category_abbr}_{self.case_counter:03d}"
-        
         # 创建测试用例
-        case = TestCase(
-            test_case_id=test_case_id,
+        case = FastTestCase(
+            test_case_id="",  # 生成结束后由 _number_cases 统一编号
             title="",  # 将在具体生成方法中设置
             category=test_point.category,
             priority=test_point.priority,
@@ -1595,153 +2202,174 @@ class TestCaseGenerator:
         
         return case
     
-    def _get_category_abbreviation(self, category: TestCategory) -> str:
-        """获取测试类别缩写"""
-        abbreviations = {
-            TestCategory.FUNCTIONAL: "功能",
-            TestCategory.COMPATIBILITY: "兼容",
-            TestCategory.USABILITY: "易用"
-        }
-        return abbreviations.get(category, "其他")
+    def _get_case_id_prefix(self, category: TestCategory) -> str:
+        """获取用例编号前缀（TC_ + 测试类别缩写 + _）"""
+        return _CASE_ID_PREFIXES.get(category, "TC_其他_")
     
-    def _optimize_test_cases(self, cases: List[TestCase]) -> List[TestCase]:
-        """优化测试用例：去重、排序、质量控制"""
-        if not cases:
-            return []
-        
-        # 1. 去重
-        unique_cases = self._remove_duplicates(cases)
+    def _optimize_test_cases(self, cases: Iterable[FastTestCase]) -> List[FastTestCase]:
+        """优化测试用例：去重、排序、质量控制
         
-        # 2. 质量过滤
-        quality_cases = self._filter_quality_cases(unique_cases)
+        cases 可以是惰性迭代器，按块消费：只保留签名和合格用例，重复和不合格用例随即释放。
+        去重和数量限制都作用于全部用例，不能按测试要点拆分到多个进程并行；
+        用例总量有上限，单进程处理的耗时也远小于进程间传输用例的开销。
+        """
+        debug_enabled = self.logger.is_debug_enabled()
+        seen_signatures = set()
+        cases_by_priority = [[] for _ in _MAX_CASES_PER_PRIORITY]
+        total_count = 0
+        
+        case_iter = iter(cases)
+        while True:
+            chunk = list(islice(case_iter, _OPTIMIZE_CHUNK_SIZE))
+            if not chunk:
+                break
+            total_count += len(chunk)
+            
+            for signature, case in zip(self._generate_case_signatures(chunk), chunk):
+                # 1. 去重：按签名保留首次出现的用例。先去重再做质量检查：
+                #    与不合格用例重复的后续用例同样被移除
+                if signature in seen_signatures:
+                    continue
+                seen_signatures.add(signature)
+                
+                # 2. 质量过滤，合格用例按优先级分桶
+                if self._is_quality_case(case, debug_enabled):
+                    cases_by_priority[case.priority_rank].append(case)
         
-        # 3. 按优先级排序
-        sorted_cases = sorted(quality_cases, key=lambda x: (
-            x.priority.value,  # 优先级排序
-            x.category.value,  # 类别排序
-            x.title  # 标题排序
-        ))
+        if debug_enabled and len(seen_signatures) < total_count:
+            self.logger.debug(f"移除重复用例: {total_count - len(seen_signatures)} 个")
         
-        # 4. 控制数量（避免用例过多）
-        final_cases = self._limit_case_count(sorted_cases)
+        # 3. 控制数量（避免用例过多）：各优先级只取排序靠前的若干个
+        final_cases = self._limit_case_count(cases_by_priority)
         
         return final_cases
     
-    def _remove_duplicates(self, cases: List[TestCase]) -> List[TestCase]:
-        """移除重复的测试用例"""
-        unique_cases = []
-        seen_signatures = set()
+    def _is_quality_case(self, case: FastTestCase, log_rejection: bool = True) -> bool:
+        """检查用例质量，不合格且 log_rejection 为真时记录原因"""
+        # 按检查代价从低到高排列，多数不合格用例在整数比较处即被排除
+        # 基本质量检查
+        if not case.title or not case.steps:
+            if log_rejection:
+                self.logger.debug(f"移除不完整用例: {case.title}")
+            return False
         
-        for case in cases:
-            signature = self._generate_case_signature(case)
-            if signature not in seen_signatures:
-                seen_signatures.add(signature)
-                unique_cases.append(case)
-            else:
-                self.logger.debug(f"移除重复用例: {case.title}")
+        # 标题长度检查
+        if len(case.title) > 60:
+            if log_rejection:
+                self.logger.debug(f"移除标题过长用例: {case.title}")
+            return False
         
-        return unique_cases
-    
-    def _filter_quality_cases(self, cases: List[TestCase]) -> List[TestCase]:
-        """过滤低质量的测试用例"""
-        quality_cases = []
+        # 步骤数量合理性检查（动态范围）
+        step_count = len(case.steps)
+        if step_count < 2:
+            if log_rejection:
+                self.logger.debug(f"移除步骤过少用例: {case.title} (步骤数: {step_count})")
+            return False
+        elif step_count > 10:
+            if log_rejection:
+                self.logger.debug(f"移除步骤过多用例: {case.title} (步骤数: {step_count})")
+            return False
         
-        for case in cases:
-            # 基本质量检查
-            if not case.title or not case.steps or not case.expected_result:
+        if not case.expected_result:
+            if log_rejection:
                 self.logger.debug(f"移除不完整用例: {case.title}")
-                continue
-            
-            # 步骤质量检查
-            if not all(step.action and step.expected for step in case.steps):
+            return False
+        
+        # 步骤完整性和内容质量检查（一次遍历步骤）
+        low_quality_count = self._count_low_quality_steps(case.steps)
+        if low_quality_count is None:
+            if log_rejection:
                 self.logger.debug(f"移除步骤不完整用例: {case.title}")
-                continue
-            
-            # 步骤数量合理性检查（动态范围）
-            step_count = len(case.steps)
-            if step_count < 2:
-                self.logger.debug(f"移除步骤过少用例: {case.title} (步骤数: {step_count})")
-                continue
-            elif step_count > 10:
-                self.logger.debug(f"移除步骤过多用例: {case.title} (步骤数: {step_count})")
-                continue
-            
-            # 标题长度检查
-            if len(case.title) > 60:
-                self.logger.debug(f"移除标题过长用例: {case.title}")
-                continue
-            
-            # 步骤内容质量检查
-            if self._has_low_quality_steps(case.steps):
+            return False
+        
+        # 如果超过80%的步骤都是低质量的，才认为整体质量低（整数比较）
+        if low_quality_count * 5 > step_count * 4:
+            if log_rejection:
                 self.logger.debug(f"移除低质量步骤用例: {case.title}")
-                continue
-            
-            quality_cases.append(case)
+            return False
         
-        return quality_cases
+        return True
     
-    def _has_low_quality_steps(self, steps: List[TestStep]) -> bool:
-        """检查是否包含低质量的步骤"""
-        if not steps:
-            return True
-            
+    @staticmethod
+    def _count_low_quality_steps(steps: List[FastTestStep]) -> Optional[int]:
+        """统计低质量步骤数，存在缺少操作或期望结果的步骤时返回 None"""
         low_quality_count = 0
+        phrases = _LOW_QUALITY_PHRASES
         
         for step in steps:
+            action = step.action
+            expected = step.expected
+            if not action or not expected:
+                return None
+            
             # 检查步骤是否过于简单
-            if len(step.action) < 3 or len(step.expected) < 3:
+            if len(action) < 3 or len(expected) < 3:
                 low_quality_count += 1
                 continue
             
             # 检查是否包含过多完全模板化的语言
-            highly_template_phrases = ["执行操作", "检查结果"]
-            if any(phrase == step.action.strip() or phrase == step.expected.strip() for phrase in highly_template_phrases):
-                low_quality_count += 1
+            low_quality_count += (step.stripped_action in phrases) | (step.stripped_expected in phrases)
         
-        # 如果超过80%的步骤都是低质量的，才认为整体质量低
-        return low_quality_count > len(steps) * 0.8
+        return low_quality_count
     
-    def _limit_case_count(self, cases: List[TestCase]) -> List[TestCase]:
-        """限制用例数量，避免过多"""
-        max_cases_per_priority = {
-            Priority.P0: 3,  # P0最多3个
-            Priority.P1: 4,  # P1最多4个
-            Priority.P2: 2,  # P2最多2个
-            Priority.P3: 1   # P3最多1个
-        }
+    def _limit_case_count(self, cases_by_priority: List[List[FastTestCase]]) -> List[FastTestCase]:
+        """限制用例数量，避免过多
         
+        cases_by_priority 按优先级序号分桶；按优先级从高到低输出，
+        同一优先级内按类别、标题排序后取前若干个。
+        """
         limited_cases = []
-        priority_counts = {p: 0 for p in Priority}
-        
-        for case in cases:
-            max_count = max_cases_per_priority.get(case.priority, 2)
-            if priority_counts[case.priority] < max_count:
-                limited_cases.append(case)
-                priority_counts[case.priority] += 1
+        for max_count, priority_cases in zip(_MAX_CASES_PER_PRIORITY, cases_by_priority):
+            limited_cases.extend(heapq.nsmallest(
+                max_count,
+                priority_cases,
+                key=lambda x: (x.category_rank, x.title)
+            ))
         
         return limited_cases
     
-    def _generate_case_signature(self, case: TestCase) -> str:
-        """生成用例签名用于去重"""
-        # 使用标题的关键词生成签名
-        title_words = re.findall(r'\w+', case.title.lower())
-        title_key = '_'.join(sorted(title_words)[:3])  # 取前3个关键词
-        
-        # 使用步骤数量和类型
-        steps_key = f"{len(case.steps)}_{case.category.value}"
-        
-        return f"{title_key}_{steps_key}"
+    def _generate_case_signatures(self, cases: List[FastTestCase]) -> List[Tuple]:
+        """批量生成用例签名
+        
+        用例较多时把所有标题拼接后只做一次正则扫描，再按分隔符切回各用例，
+        结果与逐个调用 _generate_case_signature 一致。
+        """
+        joined = None
+        if len(cases) > _BATCH_SIGNATURE_THRESHOLD:
+            joined = _TITLE_SEPARATOR.join(case.title for case in cases).lower()
+        # 用例少或标题本身含分隔符时逐个生成
+        if joined is None or joined.count(_TITLE_SEPARATOR) != len(cases) - 1:
+            return [self._generate_case_signature(case) for case in cases]
+        
+        signatures = []
+        title_words = []
+        cases_iter = iter(cases)
+        for token in _BATCH_WORD_RE.findall(joined) + [_TITLE_SEPARATOR]:
+            if token == _TITLE_SEPARATOR:
+                case = next(cases_iter)
+                signatures.append((*sorted(title_words)[:3], len(case.steps), case.category_rank))
+                title_words = []
+            else:
+                title_words.append(token)
+        return signatures
+    
+    def _generate_case_signature(self, case: FastTestCase) -> Tuple:
+        """生成用例签名用于去重
+        
+        签名为元组，直接参与哈希，无需拼接字符串。
+        """
+        # 使用标题的关键词（取排序后的前3个）、步骤数量和类别
+        title = case.title.lower()
+        if title.isascii():
+            words = title.translate(_ASCII_NON_WORD_TABLE).split()
+        else:
+            words = _WORD_RE.findall(title)
+        title_words = sorted(words)[:3]
+        return (*title_words, len(case.steps), case.category_rank)
     
     def _is_supported_category(self, category: str) -> bool:
         """检查测试类别是否被支持"""
         if not category:
             return False
-            
-        # 支持的测试类别
-        supported_categories = {
-            "功能测试",
-            "兼容性测试", 
-            "易用性测试"
-        }
         
-        return category in supported_categories
+        return category in _SUPPORTED_CATEGORIES
@@ -4,12 +4,18 @@ XMind 导出器
 负责将测试用例导出为 XMind 思维导图格式。
 """
 
+from collections import Counter
 from typing import List, Dict
 from datetime import datetime
 from pathlib import Path
+import io
+import zipfile
 import xmind
-from xmind.core.topic import TopicElement
+from xmind.core.comments import CommentsBookDocument
 from xmind.core.markerref import MarkerId
+from xmind.core.styles import StylesBookDocument
+from xmind.core.topic import TopicElement, TopicsElement
+from xmind.core.workbook import WorkbookDocument
 from utils.models import TestCase, Priority
 from utils.log_manager import StructuredLogger
 
@@ -27,12 +33,12 @@ class XMindExporter:
         Priority.P3: "#90EE90",  # 绿色
     }
     
-    # 优先级图标映射
+    # 优先级图标映射（预先创建 MarkerId，addMarker 不再为每个用例包装图标名）
     PRIORITY_MARKERS = {
-        Priority.P0: MarkerId.starRed,
-        Priority.P1: MarkerId.starOrange,
-        Priority.P2: MarkerId.starYellow,
-        Priority.P3: MarkerId.starGreen,
+        Priority.P0: MarkerId(MarkerId.starRed),
+        Priority.P1: MarkerId(MarkerId.starOrange),
+        Priority.P2: MarkerId(MarkerId.starYellow),
+        Priority.P3: MarkerId(MarkerId.starGreen),
     }
     
     def __init__(self):
@@ -41,23 +47,21 @@ class XMindExporter:
         self.sheet = None
         self.root_topic = None
         self.category_topics = {}
+        # 各类别下最后添加的用例主题，后续用例直接追加在其后
+        self._last_case_topics = {}
         self.logger = logger
     
     def create_workbook(self, title: str):
         """创建 XMind 工作簿"""
         try:
             # 创建新工作簿
-            from xmind.core.workbook import WorkbookDocument
-            
             self.workbook = WorkbookDocument()
             
             # 初始化必需的组件
             if not hasattr(self.workbook, 'stylesbook') or self.workbook.stylesbook is None:
-                from xmind.core.styles import StylesBookDocument
                 self.workbook.stylesbook = StylesBookDocument()
             
             if not hasattr(self.workbook, 'commentsbook') or self.workbook.commentsbook is None:
-                from xmind.core.comments import CommentsBookDocument
                 self.workbook.commentsbook = CommentsBookDocument()
             
             # 获取第一个工作表
@@ -85,12 +89,15 @@ class XMindExporter:
                 category_topic.setTitle(f"📁 {category_name}")
                 self.category_topics[category_name] = category_topic
             
-            category_topic = self.category_topics[category_name]
-            
             # 创建测试用例主题
-            case_topic = category_topic.addSubTopic()
             case_title = f"[{test_case.priority.value}] {test_case.title}"
-            case_topic.setTitle(case_title)
+            last_case_topic = self._last_case_topics.get(category_name)
+            if last_case_topic is None:
+                case_topic = self.category_topics[category_name].addSubTopic()
+                case_topic.setTitle(case_title)
+            else:
+                case_topic = self._append_sibling_topic(last_case_topic, case_title)
+            self._last_case_topics[category_name] = case_topic
             
             # 添加优先级标记
             self._add_priority_marker(case_topic, test_case.priority)
@@ -107,10 +114,14 @@ class XMindExporter:
                 steps_topic = case_topic.addSubTopic()
                 steps_topic.setTitle("🔧 测试步骤")
                 
+                step_topic = None
                 for step in test_case.steps:
-                    step_topic = steps_topic.addSubTopic()
                     step_text = f"{step.step_no}. {step.action}"
-                    step_topic.setTitle(step_text)
+                    if step_topic is None:
+                        step_topic = steps_topic.addSubTopic()
+                        step_topic.setTitle(step_text)
+                    else:
+                        step_topic = self._append_sibling_topic(step_topic, step_text)
                     
                     # 为每个步骤添加期望结果子节点
                     if step.expected:
@@ -140,34 +151,37 @@ class XMindExporter:
             total_topic = stats_topic.addSubTopic()
             total_topic.setTitle(f"总用例数: {len(test_cases)}")
             
-            # 优先级分布
-            priority_dist = {}
+            # 一次遍历统计优先级、类别分布和步骤数量
+            priority_dist = Counter()
+            category_dist = Counter()
+            step_total = step_case_count = 0
+            max_steps = 0
+            min_steps = None
             for case in test_cases:
-                priority = case.priority.value
-                priority_dist[priority] = priority_dist.get(priority, 0) + 1
+                priority_dist[case.priority.value] += 1
+                category_dist[case.category.value] += 1
+                step_count = len(case.steps)
+                if step_count:
+                    step_total += step_count
+                    step_case_count += 1
+                    max_steps = max(max_steps, step_count)
+                    min_steps = step_count if min_steps is None else min(min_steps, step_count)
             
+            # 优先级分布
             if priority_dist:
                 priority_topic = stats_topic.addSubTopic()
                 priority_parts = [f"{p}({c})" for p, c in sorted(priority_dist.items())]
                 priority_topic.setTitle(f"优先级分布: {', '.join(priority_parts)}")
             
             # 类别分布
-            category_dist = {}
-            for case in test_cases:
-                category = case.category.value
-                category_dist[category] = category_dist.get(category, 0) + 1
-            
             if category_dist:
                 category_topic = stats_topic.addSubTopic()
                 category_parts = [f"{c}({n})" for c, n in sorted(category_dist.items())]
                 category_topic.setTitle(f"类别分布: {', '.join(category_parts)}")
             
             # 步骤数量统计
-            step_counts = [len(case.steps) for case in test_cases if case.steps]
-            if step_counts:
-                avg_steps = sum(step_counts) / len(step_counts)
-                max_steps = max(step_counts)
-                min_steps = min(step_counts)
+            if step_case_count:
+                avg_steps = step_total / step_case_count
                 
                 steps_topic = stats_topic.addSubTopic()
                 steps_topic.setTitle(f"步骤统计: 平均{avg_steps:.1f}步, 最多{max_steps}步, 最少{min_steps}步")
@@ -183,29 +197,16 @@ class XMindExporter:
             output_path: 输出文件路径
         """
         try:
-            import zipfile
-            import io
-            
             # 确保输出目录存在
             output_file = Path(output_path)
             output_file.parent.mkdir(parents=True, exist_ok=True)
             
             # 直接创建 ZIP 文件
             with zipfile.ZipFile(str(output_file), 'w', zipfile.ZIP_DEFLATED) as zf:
-                # 生成 content.xml
-                content_stream = io.StringIO()
-                self.workbook.output(content_stream)
-                zf.writestr('content.xml', content_stream.getvalue().encode('utf-8'))
-                
-                # 生成 styles.xml
-                styles_stream = io.StringIO()
-                self.workbook.stylesbook.output(styles_stream)
-                zf.writestr('styles.xml', styles_stream.getvalue().encode('utf-8'))
-                
-                # 生成 comments.xml
-                comments_stream = io.StringIO()
-                self.workbook.commentsbook.output(comments_stream)
-                zf.writestr('comments.xml', comments_stream.getvalue().encode('utf-8'))
+                # 生成 content.xml、styles.xml、comments.xml
+                self._write_xml_entry(zf, 'content.xml', self.workbook)
+                self._write_xml_entry(zf, 'styles.xml', self.workbook.stylesbook)
+                self._write_xml_entry(zf, 'comments.xml', self.workbook.commentsbook)
                 
                 # 添加 meta.xml
                 meta_xml = '''<?xml version="1.0" encoding="UTF-8" standalone="no"?>
@@ -236,6 +237,30 @@ class XMindExporter:
             self.logger.log_error(e, {"operation": "save", "output_path": output_path})
             raise
     
+    @staticmethod
+    def _write_xml_entry(zf, name: str, document):
+        """将文档序列化后直接写入 ZIP 条目
+        
+        边序列化边压缩，不在内存中保留完整的 XML 字符串及其编码副本。
+        newline='' 关闭换行符转换，多行文本在各平台都按原样写入。
+        """
+        with zf.open(name, 'w') as entry:
+            with io.TextIOWrapper(entry, encoding='utf-8', newline='') as stream:
+                document.output(stream)
+    
+    def _append_sibling_topic(self, sibling: TopicElement, title: str) -> TopicElement:
+        """在已有主题之后追加一个同级主题
+        
+        xmind 的 addSubTopic 每次都会重新包装父主题下已有的全部子主题，
+        同级主题多时总开销随数量平方增长；这里直接追加到同级主题所在的容器中。
+        """
+        owner_workbook = sibling.getOwnerWorkbook()
+        topics = TopicsElement(sibling.getParentNode(), owner_workbook)
+        topic = TopicElement(None, owner_workbook)
+        topics.appendChild(topic)
+        topic.setTitle(title)
+        return topic
+    
     def _add_priority_marker(self, topic: TopicElement, priority: Priority):
         """添加优先级标记"""
         try:
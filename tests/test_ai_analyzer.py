@@ -255,7 +255,15 @@ class TestAITestPointAnalyzer:
         # 验证可以解析
         parsed = json.loads(json_str)
         assert parsed["key"] == "value"
-    
+
+    def test_extract_json_braces_in_string(self, analyzer):
+        """测试字符串内的括号不影响 JSON 提取"""
+        text = '```json\n{"key": "a } b", "other": "{x"}\n```\n结尾说明 {无关}'
+
+        json_str = analyzer._extract_json(text)
+
+        assert json.loads(json_str) == {"key": "a } b", "other": "{x"}
+
     def test_fix_json_trailing_comma(self, analyzer):
         """测试修复尾部逗号"""
         bad_json = '{"key": "value",}'
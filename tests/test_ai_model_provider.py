@@ -121,6 +121,27 @@ class TestOpenAIProvider:
         assert result == "测试响应内容"
         mock_client.chat.completions.create.assert_called_once()
     
+    @patch('core.ai_model_provider.OpenAI')
+    def test_chat_with_system_prompt(self, mock_openai_class):
+        """测试单次请求指定系统提示词"""
+        mock_client = MagicMock()
+        mock_openai_class.return_value = mock_client
+        mock_client.chat.completions.create.return_value.choices[0].message.content = "测试响应内容"
+        
+        provider = OpenAIProvider(
+            api_key="test_key",
+            model_name="gpt-4o-mini"
+        )
+        provider.chat("测试提示词", system_prompt="固定说明")
+        provider.chat("测试提示词")
+        
+        calls = mock_client.chat.completions.create.call_args_list
+        assert calls[0].kwargs["messages"] == [
+            {"role": "system", "content": "固定说明"},
+            {"role": "user", "content": "测试提示词"}
+        ]
+        assert calls[1].kwargs["messages"][0]["content"] == provider.system_prompt
+    
     @patch('core.ai_model_provider.OpenAI')
     @patch('core.ai_model_provider.time.sleep')  # Mock sleep to speed up test
     def test_chat_with_retry(self, mock_sleep, mock_openai_class):
@@ -152,11 +173,40 @@ class TestOpenAIProvider:
         assert mock_client.chat.completions.create.call_count == 2
         mock_sleep.assert_called_once()  # Should have slept once between retries
 
+    @patch('core.ai_model_provider.OpenAI')
+    def test_chat_stream(self, mock_openai_class):
+        """测试流式聊天请求及提前结束时关闭响应"""
+        mock_client = MagicMock()
+        mock_openai_class.return_value = mock_client
+        
+        # 模拟流式响应分片
+        chunks = []
+        for content in ["第一段", None, "第二段", "第三段"]:
+            chunk = MagicMock()
+            chunk.choices[0].delta.content = content
+            chunks.append(chunk)
+        mock_stream = MagicMock()
+        mock_stream.__iter__.return_value = iter(chunks)
+        mock_client.chat.completions.create.return_value = mock_stream
+        
+        provider = OpenAIProvider(
+            api_key="test_key",
+            model_name="gpt-4o-mini"
+        )
+        stream = provider.chat_stream("测试提示词")
+        
+        assert next(stream) == "第一段"
+        assert next(stream) == "第二段"
+        stream.close()
+        
+        assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+        mock_stream.close.assert_called_once()
+
 
 class TestCustomProvider:
     """测试自定义提供商"""
     
-    @patch('core.ai_model_provider.requests.post')
+    @patch('core.ai_model_provider.requests.Session.post')
     def test_chat_success(self, mock_post):
         """测试成功的聊天请求"""
         # 模拟响应
@@ -184,7 +234,7 @@ class TestCustomProvider:
         assert result == "自定义响应内容"
         mock_post.assert_called_once()
     
-    @patch('core.ai_model_provider.requests.post')
+    @patch('core.ai_model_provider.requests.Session.post')
     def test_chat_auth_error(self, mock_post):
         """测试认证错误"""
         # 模拟 401 响应
@@ -4,6 +4,7 @@
 
 import pytest
 import json
+import zipfile
 from pathlib import Path
 from core.export_manager import ExportManager
 from utils.models import TestCase, TestStep, TestCategory, Priority
@@ -141,6 +142,18 @@ class TestExportManager:
         assert result is True
         assert output_path.exists()
     
+    def test_export_to_xmind_keeps_newlines(self, export_manager, sample_test_cases, temp_output_dir):
+        """测试 XMind 内容中的多行文本不做换行符转换"""
+        output_path = temp_output_dir / "multiline.xmind"
+        sample_test_cases[0].title = "用户登录\n验证"
+        
+        export_manager.export_to_xmind(sample_test_cases, str(output_path))
+        
+        with zipfile.ZipFile(output_path) as zf:
+            content = zf.read("content.xml")
+        assert "用户登录\n验证".encode("utf-8") in content
+        assert b"\r\n" not in content
+    
     def test_json_export_structure(self, export_manager, sample_test_cases, temp_output_dir):
         """测试 JSON 导出结构完整性"""
         output_path = temp_output_dir / "structure_test.json"
@@ -0,0 +1,644 @@
+"""
+测试用例生成器测试
+"""
+
+import json
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from core import test_case_generator
+from core.ai_model_provider import AIModelFactory, AIModelProvider
+from core.test_case_generator import ScenarioInfo, TestCaseGenerator
+from utils.cache_manager import CacheManager
+from utils.models import FastTestCase, FastTestStep, TestCase, TestPoint, TestCategory, TestType, Priority
+
+
+@pytest.fixture
+def cache_manager(tmp_path):
+    """创建临时目录下的缓存管理器"""
+    return CacheManager(cache_dir=str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def generator(monkeypatch, cache_manager):
+    """创建不依赖 AI 的生成器实例"""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    return TestCaseGenerator(cache_manager=cache_manager)
+
+
+def make_test_point(description: str, **kwargs) -> TestPoint:
+    """创建测试要点"""
+    fields = {
+        "id": "TP_001",
+        "category": TestCategory.FUNCTIONAL,
+        "description": description,
+        "test_type": TestType.POSITIVE,
+        "priority": Priority.P1,
+        "scenarios": [],
+    }
+    fields.update(kwargs)
+    return TestPoint(**fields)
+
+
+class TestKeywordHelpers:
+    """测试关键词匹配辅助方法"""
+
+    @pytest.mark.parametrize("description, expected", [
+        ("用户登录功能", True),
+        ("修改权限", True),
+        ("系统配置同步", True),
+        ("商品搜索", False),
+    ])
+    def test_needs_precondition(self, generator, description, expected):
+        """测试前置条件判断"""
+        assert generator._needs_precondition(make_test_point(description)) is expected
+
+    @pytest.mark.parametrize("description, expected", [
+        ("购物车结算", "购物车页面"),
+        ("登录后加入购物车", "购物车页面"),  # 购物车优先于登录
+        ("支付前先搜索", "搜索页面"),  # 搜索优先于支付
+        ("个人资料", "相关功能页面"),
+    ])
+    def test_get_feature_context(self, generator, description, expected):
+        """测试功能上下文按优先级提取"""
+        assert generator._get_feature_context(description) == expected
+
+    @pytest.mark.parametrize("scenario, expected", [
+        ("输入密码", "输入"),
+        ("滑动列表后点击商品", "点击"),  # 点击优先于滑动
+        ("跳转后显示详情", "查看"),  # 查看优先于切换
+        ("打开应用", "操作"),
+    ])
+    def test_identify_action_type(self, scenario, expected):
+        """测试操作类型按优先级识别"""
+        assert TestCaseGenerator._identify_action_type(scenario) == expected
+
+    @pytest.mark.parametrize("scenario, expected", [
+        ("点击登录", "简单"),
+        ("输入用户名，点击登录", "中等"),
+        ("输入用户名，点击登录按钮，验证提示信息", "复杂"),
+        ("在弱网情况下输入手机号，选择地区，点击获取验证码，确认短信，检查倒计时显示", "复合"),
+        # “在…情况下”贪婪匹配到最后一个“情况下”，其中的条件词不再单独计数
+        ("在当前情况下输入", "简单"),
+        ("在弱网情况下，需要登录，在弱网情况下，需要支付，当前", "中等"),
+    ])
+    def test_analyze_scenario_complexity(self, generator, scenario, expected):
+        """测试场景复杂度分级"""
+        assert generator._analyze_scenario_complexity(scenario) == expected
+
+    def test_analyze_scenario(self, generator):
+        """测试场景分析结果"""
+        info = generator._analyze_scenario("验证点击登录按钮的功能")
+
+        assert info.name == "点击登录按钮"
+        assert info.description == "验证点击登录按钮的功能"
+        assert info.action_type == "点击"
+        assert info.expected_result == "界面响应及时，功能执行正确"
+
+
+class TestGenerateTestCases:
+    """测试用例生成流程"""
+
+    def test_generate_from_scenarios(self, generator):
+        """测试基于场景生成用例"""
+        test_points = {
+            "feature_name": "登录",
+            "test_points": [{
+                "id": "TP_001",
+                "category": "功能测试",
+                "description": "用户登录",
+                "test_type": "正向测试",
+                "priority": "P0",
+                "scenarios": [
+                    "打开应用进入登录页，输入用户名和密码，点击登录按钮，验证跳转到首页",
+                ],
+            }],
+        }
+
+        cases = generator.generate_test_cases(test_points)
+
+        assert len(cases) == 1
+        case = cases[0]
+        assert case["test_case_id"] == "TC_功能_001"
+        assert case["priority"] == Priority.P0
+        assert case["title"].startswith("用户登录 - ")
+        assert [step["step_no"] for step in case["steps"]] == list(range(1, len(case["steps"]) + 1))
+
+    def test_generate_json_matches_dicts(self, generator):
+        """测试 JSON 输出与字典结果一致"""
+        test_points = {
+            "feature_name": "登录",
+            "test_points": [{
+                "id": "TP_001",
+                "category": "功能测试",
+                "description": "用户登录",
+                "test_type": "正向测试",
+                "priority": "P0",
+                "scenarios": ["打开应用进入登录页，输入用户名和密码，点击登录按钮，验证跳转到首页"],
+            }],
+        }
+
+        expected = generator.generate_test_cases(test_points)
+        result = json.loads(generator.generate_test_cases_json(test_points))
+
+        assert result == expected
+
+    def test_skip_unsupported_category(self, generator):
+        """测试跳过不支持的类别"""
+        test_points = {
+            "feature_name": "登录",
+            "test_points": [{
+                "id": "TP_001",
+                "category": "性能测试",
+                "description": "登录响应时间",
+                "test_type": "正向测试",
+                "priority": "P0",
+                "scenarios": ["验证登录响应时间"],
+            }],
+        }
+
+        assert generator.generate_test_cases(test_points) == []
+
+    def test_same_test_points_reuse_result(self, generator, monkeypatch):
+        """测试相同测试要点重复生成时复用结果"""
+        test_points = {
+            "feature_name": "登录",
+            "test_points": [{
+                "id": "TP_001",
+                "category": "功能测试",
+                "description": "用户登录",
+                "test_type": "正向测试",
+                "priority": "P0",
+                "scenarios": ["打开应用进入登录页，输入用户名和密码，点击登录按钮，验证跳转到首页"],
+            }],
+        }
+        calls = []
+        build_final_cases = generator._build_final_cases
+        monkeypatch.setattr(generator, "_build_final_cases", lambda points: calls.append(points) or build_final_cases(points))
+
+        first = generator.generate_test_cases(test_points)
+        second = generator.generate_test_cases(json.loads(json.dumps(test_points)))
+        test_points["test_points"][0]["priority"] = "P1"
+        third = generator.generate_test_cases(test_points)
+
+        assert first == second
+        assert third[0]["priority"] == Priority.P1
+        assert len(calls) == 2
+
+    def test_ai_failure_result_not_reused(self, cache_manager, monkeypatch):
+        """测试 AI 请求失败回退模板时，下次生成不复用该结果"""
+        class FailingProvider:
+            """请求总是超时的模拟 AI 提供者"""
+            def __init__(self):
+                self.calls = 0
+
+            def chat(self, prompt, **kwargs):
+                self.calls += 1
+                raise TimeoutError("请求超时")
+
+        provider = FailingProvider()
+        generator = TestCaseGenerator(ai_provider=provider, cache_manager=cache_manager)
+        test_points = {
+            "feature_name": "登录",
+            "test_points": [{
+                "id": "TP_001",
+                "category": "功能测试",
+                "description": "用户登录",
+                "test_type": "正向测试",
+                "priority": "P0",
+                "scenarios": ["打开应用进入登录页，输入用户名和密码，点击登录按钮，验证跳转到首页"],
+            }],
+        }
+        calls = []
+        build_final_cases = generator._build_final_cases
+        monkeypatch.setattr(generator, "_build_final_cases", lambda points: calls.append(points) or build_final_cases(points))
+
+        generator.generate_test_cases(test_points)
+        first_run_calls = provider.calls
+        generator.generate_test_cases(test_points)
+
+        assert first_run_calls > 0
+        assert provider.calls > first_run_calls
+        assert len(calls) == 2
+
+    def test_unparsable_ai_response_result_not_reused(self, cache_manager, monkeypatch):
+        """测试 AI 响应无法解析而回退模板时，下次生成不复用该结果"""
+        class TextProvider:
+            """只返回普通文本的模拟 AI 提供者"""
+            def chat(self, prompt, **kwargs):
+                return "好的，请稍后"
+
+        generator = TestCaseGenerator(ai_provider=TextProvider(), cache_manager=cache_manager)
+        test_points = {
+            "feature_name": "登录",
+            "test_points": [{
+                "id": "TP_001",
+                "category": "功能测试",
+                "description": "用户登录",
+                "test_type": "正向测试",
+                "priority": "P0",
+                "scenarios": ["打开应用进入登录页，输入用户名和密码，点击登录按钮，验证跳转到首页"],
+            }],
+        }
+        calls = []
+        build_final_cases = generator._build_final_cases
+        monkeypatch.setattr(generator, "_build_final_cases", lambda points: calls.append(points) or build_final_cases(points))
+
+        generator.generate_test_cases(test_points)
+        generator.generate_test_cases(test_points)
+
+        assert len(calls) == 2
+
+    def test_provider_with_non_str_attributes(self, cache_manager):
+        """测试提供者的接口地址、模型名不是字符串时仍可生成"""
+        class PathProvider:
+            """接口地址为 Path 对象的模拟 AI 提供者"""
+            base_url = Path("/api/v1")
+            model_name = None
+
+            def chat(self, prompt, **kwargs):
+                return "登录成功"
+
+        generator = TestCaseGenerator(ai_provider=PathProvider(), cache_manager=cache_manager)
+        test_points = {
+            "feature_name": "登录",
+            "test_points": [{
+                "id": "TP_001",
+                "category": "功能测试",
+                "description": "用户登录",
+                "test_type": "正向测试",
+                "priority": "P0",
+                "scenarios": ["点击登录按钮"],
+            }],
+        }
+
+        assert generator.generate_test_cases(test_points)
+
+    def test_case_to_dict_matches_model_dump(self, generator):
+        """测试用例字典与 Pydantic 模型导出结果一致"""
+        test_point = make_test_point("用户登录", scenarios=["输入用户名和密码，点击登录按钮，验证跳转到首页"])
+        case = generator._generate_practical_cases(test_point)[0]
+        result = generator._case_to_dict(case)
+
+        assert result == asdict(case)
+        assert TestCase(**result).model_dump() == result
+
+    def test_batch_signatures_match_single(self, generator):
+        """测试批量生成的用例签名与逐个生成一致"""
+        step = FastTestStep(step_no=1, action="点击登录按钮", expected="登录成功")
+        cases = [
+            FastTestCase(
+                test_case_id="",
+                title=f"Login 用户登录 - 场景{i} {'Check' if i % 2 else ''}",
+                category=list(TestCategory)[i % 3],
+                priority=Priority.P0,
+                case_type="正向测试",
+                steps=[step] * (i % 4 + 1),
+                expected_result="登录成功",
+                description="",
+            )
+            for i in range(40)
+        ]
+
+        assert generator._generate_case_signatures(cases) == [
+            generator._generate_case_signature(case) for case in cases
+        ]
+
+    def test_concurrent_generation_keeps_order(self, monkeypatch, cache_manager):
+        """测试并发生成时用例顺序与编号保持稳定"""
+        class SlowProvider:
+            """响应时间递减的模拟 AI 提供者"""
+            def __init__(self):
+                self.delays = iter([0.05, 0.03, 0.01] * 10)
+
+            def chat(self, prompt, **kwargs):
+                time.sleep(next(self.delays, 0))
+                return ""
+
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        generator = TestCaseGenerator(ai_provider=SlowProvider(), max_concurrency=3, cache_manager=cache_manager)
+        test_points = {
+            "feature_name": "登录",
+            "test_points": [
+                {
+                    "id": f"TP_00{i}",
+                    "category": "功能测试",
+                    "description": f"要点{i}",
+                    "test_type": "正向测试",
+                    "priority": "P0",
+                    "scenarios": ["输入用户名和密码，点击登录按钮，验证跳转到首页"],
+                }
+                for i in range(1, 4)
+            ],
+        }
+
+        cases = generator.generate_test_cases(test_points)
+
+        assert [case["title"].split(" - ")[0] for case in cases] == ["要点1", "要点2", "要点3"]
+        assert [case["test_case_id"] for case in cases] == ["TC_功能_001", "TC_功能_002", "TC_功能_003"]
+
+    def test_env_provider_shared_between_generators(self, monkeypatch, cache_manager):
+        """测试从环境变量创建的 AI 提供者在生成器之间共享"""
+        created = []
+
+        def fake_create_provider(provider_name, api_key, **kwargs):
+            created.append((provider_name, api_key))
+            return object()
+
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        monkeypatch.setattr(test_case_generator, "_PROVIDER_CACHE", {})
+        monkeypatch.setattr(AIModelFactory, "create_provider", fake_create_provider)
+
+        first = TestCaseGenerator(cache_manager=cache_manager)
+        second = TestCaseGenerator(cache_manager=cache_manager)
+
+        assert first.ai_provider is second.ai_provider
+        assert created == [("openai", "test-key")]
+
+
+class TestAICache:
+    """测试 AI 响应缓存"""
+
+    class CountingProvider:
+        """记录调用次数的模拟 AI 提供者"""
+        def __init__(self, response):
+            self.response = response
+            self.calls = 0
+
+        def chat(self, prompt, **kwargs):
+            self.calls += 1
+            return self.response
+
+    def test_structurally_same_scenarios_hit_cache(self, cache_manager):
+        """测试结构相同的场景复用 AI 响应"""
+        provider = self.CountingProvider("登录成功，跳转到首页")
+        generator = TestCaseGenerator(ai_provider=provider, cache_manager=cache_manager)
+
+        first = generator._generate_ai_expected_result("验证点击登录按钮", "点击")
+        second = generator._generate_ai_expected_result("测试点击登录按钮的功能", "点击")
+
+        assert first == second == "登录成功，跳转到首页"
+        assert provider.calls == 1
+
+    def test_empty_response_not_cached(self, cache_manager):
+        """测试空响应不写入缓存"""
+        provider = self.CountingProvider("")
+        generator = TestCaseGenerator(ai_provider=provider, cache_manager=cache_manager)
+
+        assert generator._generate_ai_expected_result("点击登录按钮", "点击") is None
+        assert generator._generate_ai_expected_result("点击登录按钮", "点击") is None
+        assert provider.calls == 2
+
+    def test_skip_blank_or_oversized_prompt(self, cache_manager):
+        """测试空场景和超长提示词不请求 AI"""
+        provider = self.CountingProvider("登录成功")
+        generator = TestCaseGenerator(ai_provider=provider, cache_manager=cache_manager)
+
+        assert generator._generate_ai_expected_result("  ", "点击") is None
+        long_scenario = "点击登录按钮" * (TestCaseGenerator.AI_PROMPT_MAX_CHARS // 6 + 1)
+        assert generator._generate_ai_expected_result(long_scenario, "点击") is None
+        assert provider.calls == 0
+
+    @pytest.mark.parametrize("force_ai_simple, expected_calls", [(False, 0), (True, 1)])
+    def test_simple_scenario_skips_ai_steps(self, cache_manager, force_ai_simple, expected_calls):
+        """测试简单场景默认直接使用模板步骤"""
+        provider = self.CountingProvider('{"steps": [{"action": "点击登录", "expected": "登录成功"}]}')
+        generator = TestCaseGenerator(ai_provider=provider, cache_manager=cache_manager, force_ai_simple=force_ai_simple)
+        scenario_info = ScenarioInfo("点击登录", "点击登录", "点击", "登录成功")
+
+        generator._generate_realistic_steps(make_test_point("登录"), scenario_info)
+
+        assert provider.calls == expected_calls
+
+    def test_batch_steps_for_multiple_scenarios(self, cache_manager):
+        """测试多个场景的AI步骤合并为一次请求"""
+        class BatchProvider:
+            """按提示词类型返回响应的模拟 AI 提供者"""
+            def __init__(self):
+                self.batch_calls = 0
+
+            def chat(self, prompt, **kwargs):
+                # 固定说明可能放在系统提示词中
+                prompt = kwargs.get("system_prompt", "") + prompt
+                if "scenarios" in prompt:
+                    self.batch_calls += 1
+                    return ('{"scenarios": ['
+                            '{"steps": [{"action": "输入手机号", "expected": "输入成功"}]}, '
+                            '{"steps": []}]}')
+                if "steps" in prompt:
+                    return '{"steps": [{"action": "单独生成", "expected": "生成成功"}]}'
+                return "登录成功"
+
+        provider = BatchProvider()
+        generator = TestCaseGenerator(ai_provider=provider, cache_manager=cache_manager)
+        test_point = make_test_point("登录", scenarios=[
+            "输入手机号，点击获取验证码，验证倒计时显示",
+            "点击登录",
+            "输入错误密码，点击登录按钮，检查错误提示",
+        ])
+
+        cases = generator._generate_practical_cases(test_point)
+
+        assert provider.batch_calls == 1
+        assert [case.steps[0].action for case in cases[::2]] == ["输入手机号", "单独生成"]
+
+    def test_batch_category_steps_across_test_points(self, cache_manager):
+        """测试多个测试要点的兼容性步骤合并为一次请求"""
+        class BatchProvider:
+            """按提示词类型返回响应的模拟 AI 提供者"""
+            def __init__(self):
+                self.batch_calls = 0
+
+            def chat(self, prompt, **kwargs):
+                prompt = kwargs.get("system_prompt", "") + prompt
+                if "items" in prompt:
+                    self.batch_calls += 1
+                    return ('{"items": ['
+                            '{"steps": [{"action": "横屏打开页面", "expected": "布局正常"}]}, '
+                            '{"steps": []}]}')
+                if "steps" in prompt:
+                    return '{"steps": [{"action": "单独生成", "expected": "生成成功"}]}'
+                return "登录成功"
+
+        provider = BatchProvider()
+        generator = TestCaseGenerator(ai_provider=provider, cache_manager=cache_manager)
+        test_points = [
+            make_test_point(description, category=TestCategory.COMPATIBILITY)
+            for description in ("登录页面适配", "注册页面适配")
+        ]
+
+        generator._prefetch_ai_responses(test_points)
+        steps = [generator._generate_ai_compatibility_steps(test_point) for test_point in test_points]
+
+        assert provider.batch_calls == 1
+        assert [step_list[0].action for step_list in steps] == ["横屏打开页面", "单独生成"]
+
+    def test_batch_category_steps_split_into_groups(self, cache_manager):
+        """测试兼容性步骤批量请求按 CATEGORY_BATCH_SIZE 分组"""
+        class BatchProvider:
+            """记录每次批量请求包含要点数的模拟 AI 提供者"""
+            def __init__(self):
+                self.batch_sizes = []
+
+            def chat(self, prompt, **kwargs):
+                prompt = kwargs.get("system_prompt", "") + prompt
+                if "items" in prompt:
+                    count = prompt.count("测试类别:")
+                    self.batch_sizes.append(count)
+                    item = '{"steps": [{"action": "横屏打开页面", "expected": "布局正常"}]}'
+                    return '{"items": [' + ", ".join([item] * count) + ']}'
+                return "登录成功"
+
+        provider = BatchProvider()
+        generator = TestCaseGenerator(ai_provider=provider, cache_manager=cache_manager)
+        test_points = [
+            make_test_point(f"页面{index}适配", category=TestCategory.COMPATIBILITY)
+            for index in range(TestCaseGenerator.CATEGORY_BATCH_SIZE + 2)
+        ]
+
+        generator._prefetch_ai_responses(test_points)
+
+        assert sorted(provider.batch_sizes) == [2, TestCaseGenerator.CATEGORY_BATCH_SIZE]
+
+    def test_responses_persist_across_generators(self, cache_manager):
+        """测试响应写入磁盘缓存，新的生成器实例直接复用"""
+        provider = self.CountingProvider("登录成功，跳转到首页")
+        TestCaseGenerator(ai_provider=provider, cache_manager=cache_manager)._generate_ai_expected_result("点击登录按钮", "点击")
+
+        generator = TestCaseGenerator(ai_provider=provider, cache_manager=cache_manager)
+
+        assert generator._generate_ai_expected_result("点击登录按钮", "点击") == "登录成功，跳转到首页"
+        assert provider.calls == 1
+
+    def test_disk_cache_separates_providers(self, cache_manager):
+        """测试接口地址不同的提供者不共用磁盘缓存"""
+        first = self.CountingProvider("登录成功")
+        first.base_url = "https://a.example.com/v1"
+        second = self.CountingProvider("登录失败")
+        second.base_url = "https://b.example.com/v1"
+        TestCaseGenerator(ai_provider=first, cache_manager=cache_manager)._generate_ai_expected_result("点击登录按钮", "点击")
+
+        generator = TestCaseGenerator(ai_provider=second, cache_manager=cache_manager)
+
+        assert generator._generate_ai_expected_result("点击登录按钮", "点击") == "登录失败"
+        assert second.calls == 1
+
+    def test_disk_cache_write_failure_keeps_response(self, cache_manager, monkeypatch):
+        """测试磁盘缓存写入失败时仍返回 AI 响应"""
+        def fail_write(*args):
+            raise OSError("磁盘已满")
+
+        monkeypatch.setattr(cache_manager, "set_prompt_cache", fail_write)
+        generator = TestCaseGenerator(ai_provider=self.CountingProvider("登录成功"), cache_manager=cache_manager)
+
+        assert generator._generate_ai_expected_result("点击登录按钮", "点击") == "登录成功"
+
+    def test_prefetch_requests_scenarios_concurrently(self, cache_manager):
+        """测试同一测试要点的多个场景期望结果并发请求"""
+        class BarrierProvider:
+            """两个期望结果请求同时到达才返回的模拟 AI 提供者"""
+            def __init__(self):
+                self.barrier = threading.Barrier(2, timeout=2)
+                self.expected_calls = 0
+
+            def chat(self, prompt, **kwargs):
+                if "期望结果" in kwargs.get("system_prompt", ""):
+                    self.barrier.wait()
+                    self.expected_calls += 1
+                return "操作成功"
+
+        provider = BarrierProvider()
+        generator = TestCaseGenerator(ai_provider=provider, cache_manager=cache_manager)
+        generator.generate_test_cases({
+            "feature_name": "登录",
+            "test_points": [make_test_point("用户登录", scenarios=["点击登录", "点击注册"]).model_dump()],
+        })
+
+        assert provider.expected_calls == 2
+
+    def test_stream_stops_after_complete_json(self, cache_manager):
+        """测试流式接收到完整 JSON 后停止读取"""
+        class StreamingProvider(AIModelProvider):
+            """按分片输出的模拟 AI 提供者"""
+            def __init__(self):
+                super().__init__("test_key", "", "test-model")
+                self.received = 0
+
+            def chat(self, prompt, temperature=0.7, max_tokens=2000):
+                raise AssertionError("应使用流式接口")
+
+            def chat_stream(self, prompt, temperature=0.7, max_tokens=2000):
+                for chunk in ['{"steps": [{"action": "点击登录", ', '"expected": "登录成功"}]}', "\n说明文字"]:
+                    self.received += 1
+                    yield chunk
+
+        provider = StreamingProvider()
+        generator = TestCaseGenerator(ai_provider=provider, cache_manager=cache_manager)
+        steps = generator._generate_ai_compatibility_steps(make_test_point("登录", category=TestCategory.COMPATIBILITY))
+
+        assert [(step.action, step.expected) for step in steps] == [("点击登录", "登录成功")]
+        assert provider.received == 2
+
+    def test_stream_stops_after_first_line(self, cache_manager):
+        """测试期望结果流式接收到第一行后关闭流"""
+        class StreamingProvider(AIModelProvider):
+            """按分片输出并记录是否被关闭的模拟 AI 提供者"""
+            def __init__(self):
+                super().__init__("test_key", "", "test-model")
+                self.received = 0
+                self.closed = False
+
+            def chat(self, prompt, temperature=0.7, max_tokens=2000):
+                raise AssertionError("应使用流式接口")
+
+            def chat_stream(self, prompt, temperature=0.7, max_tokens=2000, system_prompt=None):
+                try:
+                    for chunk in ["\n", "登录成功，", "跳转到首页\n", "补充说明\n"]:
+                        self.received += 1
+                        yield chunk
+                finally:
+                    self.closed = True
+
+        provider = StreamingProvider()
+        generator = TestCaseGenerator(ai_provider=provider, cache_manager=cache_manager)
+
+        assert generator._generate_ai_expected_result("点击登录按钮", "点击") == "登录成功，跳转到首页"
+        assert provider.received == 3
+        assert provider.closed
+
+
+class TestParseAIStepsResponse:
+    """测试 AI 步骤响应解析"""
+
+    def test_parse_wrapped_json(self, generator):
+        """测试解析带说明文字和代码块的响应"""
+        response = '好的：\n```json\n{"steps": [{"action": "点击{登录}按钮", "expected": "跳转首页"}]}\n```\n以上步骤中 } 为说明'
+
+        assert generator._parse_ai_steps_response(response) == [
+            {"action": "点击{登录}按钮", "expected": "跳转首页"}
+        ]
+
+    def test_parse_escaped_quotes(self, generator):
+        """测试字符串中的转义引号不影响括号匹配"""
+        response = r'{"steps": [{"action": "输入\"}\"", "expected": "提示\\"}]} 尾部 }'
+
+        assert generator._parse_ai_steps_response(response) == [
+            {"action": '输入"}"', "expected": "提示\\"}
+        ]
+
+    def test_skip_incomplete_steps(self, generator):
+        """测试过滤缺少字段或内容为空的步骤"""
+        response = '{"steps": [{"action": "输入密码", "expected": " "}, {"action": "点击登录"}, {"action": "点击登录", "expected": "登录成功"}]}'
+
+        assert generator._parse_ai_steps_response(response) == [
+            {"action": "点击登录", "expected": "登录成功"}
+        ]
+
+    @pytest.mark.parametrize("response", ["没有步骤", '{"steps": [', '{"steps": []}'])
+    def test_invalid_response(self, generator, response):
+        """测试无效响应返回 None"""
+        assert generator._parse_ai_steps_response(response) is None
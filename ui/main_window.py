@@ -24,6 +24,7 @@ from core.export_manager import ExportManager
 from ui.widgets.ocr_result_widget import OCRResultWidget
 from ui.widgets.test_point_widget import TestPointWidget
 from ui.widgets.test_case_widget import TestCaseWidget
+from ui.workers import OCRWorker, AIAnalysisWorker, TestCaseGenerationWorker
 from ui.styles import get_theme_stylesheet
 
 
@@ -346,8 +347,6 @@ class MainWindow(QMainWindow):
             self.logger.log_operation("start_ocr", file_path=self.current_file_path)
             
             # 创建 OCR 工作线程
-            from ui.workers import OCRWorker
-            
             self.ocr_worker = OCRWorker(self.ocr_engine, self.current_file_path)
             
             # 连接信号
@@ -445,8 +444,6 @@ class MainWindow(QMainWindow):
             self.logger.log_operation("start_ai_analysis", text_length=len(text))
             
             # 创建 AI 分析工作线程
-            from ui.workers import AIAnalysisWorker
-            
             self.ai_worker = AIAnalysisWorker(self.ai_analyzer, text)
             
             # 连接信号
@@ -544,8 +541,6 @@ class MainWindow(QMainWindow):
             self.logger.log_operation("generate_test_cases_start")
             
             # 创建测试用例生成工作线程
-            from ui.workers import TestCaseGenerationWorker
-            
             self.case_worker = TestCaseGenerationWorker(
                 self.test_case_generator,
                 self.test_points
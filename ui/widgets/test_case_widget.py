@@ -204,20 +204,7 @@ class TestCaseWidget(QWidget):
         """更新统计信息"""
         total = len(self.test_cases)
         
-        # 统计各类别数量
-        category_counts = {}
-        priority_counts = {}
-        
-        for case in self.test_cases:
-            # 类别统计
-            category = case.category.value if hasattr(case.category, 'value') else str(case.category)
-            category_counts[category] = category_counts.get(category, 0) + 1
-            
-            # 优先级统计
-            priority = case.priority.value if hasattr(case.priority, 'value') else str(case.priority)
-            priority_counts[priority] = priority_counts.get(priority, 0) + 1
-        
-        # 构建统计文本
+        # 构建统计文本（只显示总数，无需逐个统计类别和优先级）
         stats_parts = [f"共 {total} 个测试用例"]
         
         self.stats_label.setText(" ".join(stats_parts))
@@ -2,6 +2,8 @@
 
 import hashlib
 import json
+import os
+import tempfile
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Optional, Any
@@ -18,8 +20,10 @@ class CacheManager:
         # 创建子目录
         self.ocr_cache_dir = self.cache_dir / "ocr"
         self.ai_cache_dir = self.cache_dir / "ai"
+        self.prompt_cache_dir = self.cache_dir / "prompt"
         self.ocr_cache_dir.mkdir(exist_ok=True)
         self.ai_cache_dir.mkdir(exist_ok=True)
+        self.prompt_cache_dir.mkdir(exist_ok=True)
     
     def get_ocr_cache(self, file_path: str) -> Optional[str]:
         """获取 OCR 缓存"""
@@ -56,8 +60,7 @@ class CacheManager:
             'text': text
         }
         
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, ensure_ascii=False, indent=2)
+        self._write_json(cache_file, cache_data)
     
     def get_ai_cache(self, text: str, model_name: str) -> Optional[dict]:
         """获取 AI 分析缓存"""
@@ -94,8 +97,61 @@ class CacheManager:
             'result': result
         }
         
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, ensure_ascii=False, indent=2)
+        self._write_json(cache_file, cache_data)
+    
+    def get_prompt_cache(self, prompt: str, model_name: str) -> Optional[str]:
+        """获取提示词响应缓存"""
+        cache_key = self._get_prompt_hash(prompt, model_name)
+        cache_file = self.prompt_cache_dir / f"{cache_key}.json"
+        
+        if not cache_file.exists():
+            return None
+        
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cache_data = json.load(f)
+            
+            # 检查是否过期 (7天)
+            cached_time = datetime.fromisoformat(cache_data['timestamp'])
+            if datetime.now() - cached_time > timedelta(days=7):
+                cache_file.unlink()
+                return None
+            
+            return cache_data['response']
+        except (json.JSONDecodeError, KeyError, ValueError) as e:
+            # 缓存文件损坏，删除并返回 None（可能已被其他线程删除）
+            cache_file.unlink(missing_ok=True)
+            return None
+    
+    def set_prompt_cache(self, prompt: str, model_name: str, response: str):
+        """设置提示词响应缓存"""
+        cache_key = self._get_prompt_hash(prompt, model_name)
+        cache_file = self.prompt_cache_dir / f"{cache_key}.json"
+        
+        cache_data = {
+            'timestamp': datetime.now().isoformat(),
+            'model_name': model_name,
+            'response': response
+        }
+        
+        self._write_json(cache_file, cache_data)
+    
+    def _write_json(self, cache_file: Path, cache_data: dict):
+        """写入缓存文件
+        
+        先写入同目录的临时文件再原子替换，并发读取时不会读到写了一半的文件。
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, prefix=cache_file.stem, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
     
     def cleanup_expired_cache(self):
         """清理过期缓存"""
@@ -103,6 +159,8 @@ class CacheManager:
         self._cleanup_directory(self.ocr_cache_dir, days=7)
         # 清理 AI 缓存 (24小时)
         self._cleanup_directory(self.ai_cache_dir, hours=24)
+        # 清理提示词响应缓存 (7天)
+        self._cleanup_directory(self.prompt_cache_dir, days=7)
     
     def _get_file_hash(self, file_path: str) -> str:
         """计算文件 MD5 哈希"""
@@ -117,6 +175,11 @@ class CacheManager:
         content = f"{text}_{model_name}"
         return hashlib.md5(content.encode('utf-8')).hexdigest()
     
+    def _get_prompt_hash(self, prompt: str, model_name: str) -> str:
+        """计算提示词哈希（blake2b 比 md5 更快，16 字节摘要足够区分）"""
+        content = f"{model_name}\n{prompt}"
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+    
     def _cleanup_directory(self, directory: Path, days: int = 0, hours: int = 0):
         """清理目录中的过期文件"""
         expiry_time = datetime.now() - timedelta(days=days, hours=hours)
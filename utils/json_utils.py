@@ -0,0 +1,70 @@
+"""
+AI 响应 JSON 解析工具
+
+从模型返回的文本中提取 JSON 对象并解析，测试要点分析和测试用例生成共用；
+同时提供序列化结果的 json_dumps。
+"""
+
+import json
+import re
+from typing import Any, Optional
+
+try:
+    # orjson 为可选依赖，未安装时使用标准库 json
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj: Any) -> bytes:
+        """序列化为 UTF-8 编码的 JSON 字节串（与 orjson.dumps 输出一致）"""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+# JSON 扫描时需要处理的字符：括号、引号、转义符
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
+
+
+def extract_json_object(text: str) -> Optional[str]:
+    """提取文本中第一个完整的 JSON 对象
+
+    从第一个 '{' 开始按括号深度扫描到与之匹配的 '}'，跳过字符串内的括号。
+    只在括号、引号和转义符处停留，其余字符由正则在 C 层跳过。
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    pos = start
+    search = _JSON_TOKEN_RE.search
+    while True:
+        match = search(text, pos)
+        if match is None:
+            return None
+
+        char = match.group()
+        pos = match.end()
+        if in_string:
+            if char == '\\':
+                pos += 1  # 跳过被转义的字符
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:pos]
+
+
+def parse_json_object(text: str) -> Optional[Any]:
+    """提取并解析文本中第一个完整的 JSON 对象，找不到时返回 None
+
+    解析失败时抛出 json.JSONDecodeError（orjson 的异常是其子类）。
+    """
+    json_str = extract_json_object(text)
+    if not json_str:
+        return None
+    return json_loads(json_str)
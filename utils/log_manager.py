@@ -100,6 +100,10 @@ class StructuredLogger:
         }
         self.logger.info(f"PERFORMANCE: {json.dumps(perf_data, ensure_ascii=False)}")
     
+    def is_debug_enabled(self) -> bool:
+        """是否会记录调试日志，热点循环中据此跳过消息拼接"""
+        return self.logger.isEnabledFor(logging.DEBUG)
+    
     def debug(self, message: str, **kwargs):
         """记录调试日志"""
         if kwargs:
@@ -2,8 +2,10 @@
 数据模型定义
 
 使用 Pydantic 定义系统中使用的所有数据模型，包括测试要点、测试用例等。
+生成器内部使用不做校验的轻量数据类，输出前再转换为字典。
 """
 
+from dataclasses import dataclass
 from pydantic import BaseModel, Field
 from typing import List
 from enum import Enum
@@ -80,3 +82,52 @@ class TestCase(BaseModel):
     class Config:
         """Pydantic 配置"""
         use_enum_values = False
+
+
+@dataclass
+class FastTestStep:
+    """测试步骤（生成器内部使用，字段与 TestStep 一致，不做校验）
+
+    构造时缓存去除首尾空白后的操作和期望结果，供质量过滤直接使用。
+    使用 __slots__ 减少大批量用例的内存占用和属性访问开销。
+    """
+    __slots__ = ("step_no", "action", "expected", "stripped_action", "stripped_expected")
+
+    step_no: int
+    action: str
+    expected: str
+
+    def __post_init__(self):
+        self.stripped_action = self.action.strip()
+        self.stripped_expected = self.expected.strip()
+
+
+# 优先级、类别按取值排序后的序号，与按 .value 排序的结果一致
+PRIORITY_RANKS = {priority: rank for rank, priority in enumerate(sorted(Priority, key=lambda p: p.value))}
+CATEGORY_RANKS = {category: rank for rank, category in enumerate(sorted(TestCategory, key=lambda c: c.value))}
+
+
+@dataclass
+class FastTestCase:
+    """测试用例（生成器内部使用，字段与 TestCase 一致，不做校验）
+
+    构造时缓存优先级、类别的整数序号，排序和去重时无需再取枚举值。
+    使用 __slots__（与类属性默认值冲突，因此 description 没有默认值）。
+    """
+    __slots__ = (
+        "test_case_id", "title", "category", "priority", "case_type", "steps",
+        "expected_result", "description", "priority_rank", "category_rank",
+    )
+
+    test_case_id: str
+    title: str
+    category: TestCategory
+    priority: Priority
+    case_type: str
+    steps: List[FastTestStep]
+    expected_result: str
+    description: str
+
+    def __post_init__(self):
+        self.priority_rank = PRIORITY_RANKS[self.priority]
+        self.category_rank = CATEGORY_RANKS[self.category]